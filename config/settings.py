@@ -11,6 +11,7 @@ SCREENSHOTS_DIR = "data/screenshots"
 # Wikipedia API
 WIKIPEDIA_API_URL = "https://en.wikipedia.org/w/api.php"
 WIKIPEDIA_DIFF_BASE_URL = "https://en.wikipedia.org/w/index.php"
+WIKIPEDIA_USER_AGENT = "GovEditsBot/1.0 (Wikipedia government edit monitor; educational/transparency project)"
 
 # API Parameters
 WIKIPEDIA_RC_PARAMS = {
@@ -22,12 +23,22 @@ WIKIPEDIA_RC_PARAMS = {
     "format": "json",
     "rcdir": "newer",
 }
+WIKIPEDIA_BOT_ACCOUNT = False  # Bot accounts may request up to 5000 changes per page
+WIKIPEDIA_BOT_RCLIMIT = 5000
+WIKIPEDIA_MIN_RCLIMIT = 50  # Floor when shrinking pages after timeouts
 
 # Timing
 API_DELAY = 1.2  # Wikipedia API throttle
 BLUESKY_DELAY = 15  # Social post interval
+BLUESKY_BATCH_SIZE = 25  # Posts created per applyWrites request
+BLUESKY_UPLOAD_WORKERS = 4  # Concurrent screenshot uploads per posting round
+BLUESKY_MAX_RETRIES = 3  # applyWrites retries after a 429 rate-limit response
 QUEUE_PROCESS_DELAY = 2  # Batch processing interval
+SCREENSHOT_WORKERS = 4  # Concurrent screenshot captures (historical mode and batched alerts)
+CSV_BATCH_SIZE = 32  # Rows written per CSV flush in historical mode
 REALTIME_POLL_INTERVAL = 10  # Real-time monitoring interval (seconds)
+STATUS_REFRESH_INTERVAL = 0.2  # Minimum seconds between terminal status redraws
+STATE_SAVE_INTERVAL = 10  # Minimum seconds between last-timestamp state writes
 
 # Features
 ENABLE_BLUESKY_POSTING = True
@@ -1,10 +1,16 @@
 """
 IP Network Matching for Government Agencies
 """
+import bisect
 import csv
+import functools
+import heapq
 import ipaddress
 import logging
-from typing import Tuple
+import socket
+import struct
+from array import array
+from typing import List, Tuple
 from config.settings import GOV_IPS_FILE, FILTER_ALL, FILTER_FEDERAL, FILTER_CONGRESS
 
 
@@ -24,6 +30,7 @@ class IPNetworkCache:
         }
         self.filter_level = filter_level
         self.load_government_networks()
+        self.build_index()
 
     def normalize_ipv4(self, ip_str: str) -> str:
         """Remove leading zeros from IPv4 address octets"""
@@ -65,6 +72,30 @@ class IPNetworkCache:
             logging.warning(f"Error normalizing IPv6 address {ip_str}: {e}")
             return ip_str
 
+    def ip_to_int(self, ip_str: str) -> Tuple[str, int]:
+        """
+        Convert an IP address string to its network key and integer value
+
+        Canonical addresses (the common case for Wikipedia usernames) are parsed
+        directly with inet_pton; anything else goes through normalize_ipv4/ipv6.
+
+        Returns:
+            Tuple of ('v4' or 'v6', integer address)
+
+        Raises:
+            ValueError: If the string is not a valid IP address
+        """
+        try:
+            if ':' in ip_str:
+                return 'v6', int.from_bytes(socket.inet_pton(socket.AF_INET6, ip_str), 'big')
+            return 'v4', struct.unpack('!I', socket.inet_pton(socket.AF_INET, ip_str))[0]
+        except OSError:
+            pass
+
+        if ':' in ip_str:
+            return 'v6', int(ipaddress.IPv6Address(self.normalize_ipv6(ip_str)))
+        return 'v4', int(ipaddress.IPv4Address(self.normalize_ipv4(ip_str)))
+
     def load_government_networks(self):
         """Load IP ranges from CSV based on filter level"""
         try:
@@ -153,9 +184,9 @@ class IPNetworkCache:
                         # Check if it's IPv6 (contains ::)
                         if '::' in start_ip:
                             try:
-                                start = ipaddress.IPv6Address(self.normalize_ipv6(start_ip))
-                                end = ipaddress.IPv6Address(self.normalize_ipv6(end_ip))
-                                self.networks['v6'].append((int(start), int(end), org, is_federal, is_congress))
+                                _, start = self.ip_to_int(start_ip)
+                                _, end = self.ip_to_int(end_ip)
+                                self.networks['v6'].append((start, end, org, is_federal, is_congress))
                                 total_loaded['v6'] += 1
                                 if is_federal:
                                     federal_loaded['v6'] += 1
@@ -166,12 +197,9 @@ class IPNetworkCache:
                         else:
                             # Handle IPv4 addresses
                             try:
-                                start_ip = self.normalize_ipv4(start_ip)
-                                end_ip = self.normalize_ipv4(end_ip)
-
-                                start = ipaddress.IPv4Address(start_ip)
-                                end = ipaddress.IPv4Address(end_ip)
-                                self.networks['v4'].append((int(start), int(end), org, is_federal, is_congress))
+                                _, start = self.ip_to_int(start_ip)
+                                _, end = self.ip_to_int(end_ip)
+                                self.networks['v4'].append((start, end, org, is_federal, is_congress))
                                 total_loaded['v4'] += 1
                                 if is_federal:
                                     federal_loaded['v4'] += 1
@@ -190,31 +218,130 @@ class IPNetworkCache:
                 logging.info(f"Federal agencies: {federal_loaded['v4']} IPv4 and {federal_loaded['v6']} IPv6 ranges")
                 logging.info(f"Congress: {congress_loaded['v4']} IPv4 and {congress_loaded['v6']} IPv6 ranges")
 
+            for version in ('v4', 'v6'):
+                before = len(self.networks[version])
+                self.networks[version] = self.coalesce_ranges(self.networks[version])
+                logging.info(f"Coalesced {before}→{len(self.networks[version])} IP{version} ranges")
+
         except Exception as e:
             logging.error(f"Error loading government networks: {e}")
 
+    @staticmethod
+    def coalesce_ranges(ranges: List[Tuple]) -> List[Tuple]:
+        """
+        Sort ranges by start address and merge adjacent or overlapping ranges of the same organization
+
+        Args:
+            ranges: List of (start_ip, end_ip, organization, is_federal, is_congress) tuples
+
+        Returns:
+            New sorted list with contiguous same-organization ranges merged
+        """
+        merged = []
+        for start, end, org, is_federal, is_congress in sorted(ranges):
+            if merged:
+                prev_start, prev_end, prev_org, prev_federal, prev_congress = merged[-1]
+                if prev_org == org and start <= prev_end + 1:
+                    merged[-1] = (prev_start, max(prev_end, end), org,
+                                  prev_federal or is_federal, prev_congress or is_congress)
+                    continue
+            merged.append((start, end, org, is_federal, is_congress))
+        return merged
+
+    @staticmethod
+    def split_overlaps(ranges: List[Tuple]) -> List[Tuple[int, int, str]]:
+        """
+        Split sorted ranges into disjoint (start, end, organization) segments
+
+        Where ranges overlap, the one starting later (the inner range when
+        nested) owns the shared addresses, and the outer range resumes after
+        it ends. Ranges that don't overlap are passed through unchanged.
+
+        Args:
+            ranges: Coalesced range tuples, sorted by start address
+
+        Returns:
+            Disjoint segments sorted by start address
+        """
+        overlapping = False
+        for prev, cur in zip(ranges, ranges[1:]):
+            if cur[0] <= prev[1]:
+                overlapping = True
+                logging.warning(f"Overlapping IP ranges for {prev[2]} and {cur[2]}; "
+                                f"addresses in both resolve to {cur[2]}")
+        if not overlapping:
+            return [(start, end, org) for start, end, org, *_ in ranges]
+
+        # Sweep the range boundaries; the active range with the latest start owns each segment
+        bounds = sorted({r[0] for r in ranges} | {r[1] + 1 for r in ranges})
+        active = []
+        segments = []
+        i = 0
+        for lo, next_lo in zip(bounds, bounds[1:]):
+            while i < len(ranges) and ranges[i][0] <= lo:
+                heapq.heappush(active, (-ranges[i][0], -i, ranges[i][1], ranges[i][2]))
+                i += 1
+            while active and active[0][2] < lo:
+                heapq.heappop(active)
+            if not active:
+                continue
+
+            org = active[0][3]
+            if segments and segments[-1][2] == org and segments[-1][1] == lo - 1:
+                segments[-1] = (segments[-1][0], next_lo - 1, org)
+            else:
+                segments.append((lo, next_lo - 1, org))
+        return segments
+
+    def build_index(self):
+        """Build parallel sorted start/end/org lists for binary search lookups"""
+        self._starts = {}
+        self._ends = {}
+        self._orgs = {}
+
+        for version, networks in self.networks.items():
+            # coalesce_ranges leaves each list sorted by start address
+            ranges = self.split_overlaps(networks)
+            self._starts[version] = [r[0] for r in ranges]
+            self._ends[version] = [r[1] for r in ranges]
+            self._orgs[version] = [r[2] for r in ranges]
+
+            if version == 'v4':
+                # IPv4 bounds fit in 32 bits; packed arrays keep both bisect
+                # columns contiguous instead of lists of boxed ints
+                self._starts[version] = array('I', self._starts[version])
+                self._ends[version] = array('I', self._ends[version])
+
+        # One bit per IPv4 /16 that overlaps a range (8 KB). Government space
+        # touches ~1% of /16s, so most addresses are rejected before the bisect.
+        self._v4_prefixes = bytearray(1 << 13)
+        for start, end in zip(self._starts['v4'], self._ends['v4']):
+            for prefix in range(start >> 16, (end >> 16) + 1):
+                self._v4_prefixes[prefix >> 3] |= 1 << (prefix & 7)
+
+        # Government IPs repeat heavily across polls; a fresh cache per index
+        # keeps results tied to the ranges they were computed from
+        self._check_ip_cached = functools.lru_cache(maxsize=8192)(self._lookup_ip)
+
     def check_ip(self, ip_str: str) -> Tuple[bool, str]:
-        """Check if an IP is within any of our ranges"""
-        try:
-            # Try to normalize the IP address
-            try:
-                if ':' in ip_str:  # IPv6
-                    ip_str = self.normalize_ipv6(ip_str)
-                else:  # IPv4
-                    ip_str = self.normalize_ipv4(ip_str)
-            except:
-                pass
+        """Check if an IP is within any of our ranges (results are cached per address)"""
+        return self._check_ip_cached(ip_str)
 
-            ip = ipaddress.ip_address(ip_str)
-            ip_int = int(ip)
+    def _lookup_ip(self, ip_str: str) -> Tuple[bool, str]:
+        """Uncached range lookup behind check_ip"""
+        try:
+            # Fast path for canonical addresses, normalization only on failure
+            version, ip_int = self.ip_to_int(ip_str)
 
-            # Choose the correct network list based on IP version
-            network_list = self.networks['v6'] if isinstance(ip, ipaddress.IPv6Address) else self.networks['v4']
+            if version == 'v4':
+                prefix = ip_int >> 16
+                if not self._v4_prefixes[prefix >> 3] & (1 << (prefix & 7)):
+                    return False, ""
 
-            # Check if IP falls within any range
-            for start_ip, end_ip, org, is_federal, is_congress in network_list:
-                if start_ip <= ip_int <= end_ip:
-                    return True, org
+            # Find the last range starting at or before the IP
+            idx = bisect.bisect_right(self._starts[version], ip_int) - 1
+            if idx >= 0 and ip_int <= self._ends[version][idx]:
+                return True, self._orgs[version][idx]
 
             return False, ""
         except ValueError as e:
@@ -2,17 +2,57 @@
 Wikipedia Recent Changes API scanner
 """
 import logging
+import orjson
 import requests
-from typing import Dict, List
-from config.settings import WIKIPEDIA_API_URL, WIKIPEDIA_RC_PARAMS
+from requests.adapters import HTTPAdapter
+from urllib3.util import Retry
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from config.settings import WIKIPEDIA_API_URL, WIKIPEDIA_RC_PARAMS, WIKIPEDIA_USER_AGENT
 
 
-def fetch_recent_changes(params: Dict = None) -> Dict:
+def create_session() -> requests.Session:
+    """
+    Create an HTTP session for the Wikipedia API
+
+    The session keeps connections to en.wikipedia.org alive between fetches
+    and retries throttled or gateway-error responses with backoff. Read
+    timeouts are not retried, so they surface as requests Timeout errors
+    and callers can shrink the request instead of repeating it.
+
+    Returns:
+        Configured requests.Session
+    """
+    session = requests.Session()
+    retries = Retry(total=5, read=False, backoff_factor=0.5, status_forcelist=[429, 502, 503, 504])
+    session.mount("https://", HTTPAdapter(pool_connections=4, pool_maxsize=8, max_retries=retries))
+    session.headers.update({
+        'User-Agent': WIKIPEDIA_USER_AGENT,
+        'Accept-Encoding': 'gzip',
+    })
+    return session
+
+
+# Shared across polls so the API connection is kept alive
+_SESSION = None
+
+
+def _shared_session() -> requests.Session:
+    """Return the module's default session, creating it on first use"""
+    global _SESSION
+    if _SESSION is None:
+        _SESSION = create_session()
+    return _SESSION
+
+
+def fetch_recent_changes(params: Dict = None, session: requests.Session = None) -> Dict:
     """
     Fetch recent changes from Wikipedia API
 
     Args:
         params: Optional custom parameters (defaults to WIKIPEDIA_RC_PARAMS)
+        session: Optional session to use instead of the shared module session
 
     Returns:
         API response JSON as dict
@@ -20,15 +60,13 @@ def fetch_recent_changes(params: Dict = None) -> Dict:
     if params is None:
         params = WIKIPEDIA_RC_PARAMS.copy()
 
-    headers = {
-        'User-Agent': 'GovEditsBot/1.0 (Wikipedia government edit monitor; educational/transparency project)'
-    }
+    http = session if session is not None else _shared_session()
 
     try:
         logging.info(f"Making request with params: {params}")
-        response = requests.get(WIKIPEDIA_API_URL, params=params, headers=headers, timeout=30)
+        response = http.get(WIKIPEDIA_API_URL, params=params, timeout=(3.05, 30))
         response.raise_for_status()
-        data = response.json()
+        data = orjson.loads(response.content)
 
         changes_count = len(data.get('query', {}).get('recentchanges', []))
         logging.info(f"Received {changes_count} recent changes")
@@ -37,6 +75,9 @@ def fetch_recent_changes(params: Dict = None) -> Dict:
     except requests.RequestException as e:
         logging.warning(f"Network error while fetching changes: {e}")
         return {"query": {"recentchanges": []}}
+    except orjson.JSONDecodeError as e:
+        logging.warning(f"Invalid JSON in recent changes response: {e}")
+        return {"query": {"recentchanges": []}}
 
 
 def filter_ip_changes(changes: List[Dict]) -> List[Dict]:
@@ -57,34 +98,150 @@ def filter_ip_changes(changes: List[Dict]) -> List[Dict]:
     ]
 
 
-def filter_government_changes(changes: List[Dict], ip_cache, processed_ids: set = None) -> List[Dict]:
+def annotate_change(change: Dict, ip_cache) -> Dict:
     """
-    Filter changes to only those from government IPs
+    Cache derived fields on a change so later passes don't recompute them
+
+    Adds _user, _is_ip, and _gov/_org from a single check_ip call, plus _ts
+    (parsed timestamp) for government edits, the only ones that are later
+    displayed, saved or posted. Keys are underscore-prefixed so they can be
+    stripped before the change is persisted.
 
     Args:
-        changes: List of Wikipedia change dictionaries
+        change: Wikipedia change dictionary (modified in place)
+        ip_cache: IPNetworkCache instance for IP matching
+
+    Returns:
+        The same change dictionary
+    """
+    from utils.helpers import is_ip_address, parse_timestamp
+
+    user = change.get("user", "")
+    is_ip = is_ip_address(user)
+    is_gov, org = ip_cache.check_ip(user) if is_ip else (False, "")
+
+    if is_gov and isinstance(change.get("timestamp"), str):
+        change["_ts"] = parse_timestamp(change["timestamp"])
+    change["_user"] = user
+    change["_is_ip"] = is_ip
+    change["_gov"] = is_gov
+    change["_org"] = org
+    return change
+
+
+@dataclass
+class BatchSummary:
+    """Everything the batch logs and queue need, gathered in one pass"""
+    total: int = 0
+    ip_count: int = 0
+    ts_min: Optional[datetime] = None
+    ts_max: Optional[datetime] = None
+    gov_edits: List[Dict] = field(default_factory=list)
+    samples: List[Dict] = field(default_factory=list)
+
+
+def summarize_changes(changes: List[Dict], ip_cache, processed_ids: set = None,
+                      sample_size: int = 3) -> BatchSummary:
+    """
+    Annotate a batch and collect its statistics in a single pass
+
+    Args:
+        changes: List of Wikipedia change dictionaries (annotated in place)
         ip_cache: IPNetworkCache instance for IP matching
         processed_ids: Optional set of already processed rcids to skip
+        sample_size: Number of leading changes kept for debug logging
 
     Returns:
-        Filtered list containing only government edits
+        BatchSummary with counts, date range, government edits and samples
     """
-    from utils.helpers import is_ip_address
+    from utils.helpers import parse_timestamp
 
     if processed_ids is None:
         processed_ids = set()
 
-    government_changes = []
+    summary = BatchSummary(total=len(changes), samples=changes[:sample_size])
+    if not changes:
+        return summary
+
+    # Fixed-width UTC timestamps order correctly as strings; parse only the extremes
+    ts_min = ts_max = changes[0].get("timestamp", "")
+    all_utc = True
 
     for change in changes:
-        # Skip if already processed
-        if change.get("rcid") in processed_ids:
+        annotate_change(change, ip_cache)
+
+        ts = change.get("timestamp", "")
+        all_utc = all_utc and isinstance(ts, str) and ts.endswith("Z")
+        if all_utc:
+            if ts < ts_min:
+                ts_min = ts
+            elif ts > ts_max:
+                ts_max = ts
+
+        if change["_is_ip"]:
+            summary.ip_count += 1
+            if change["_gov"] and change.get("rcid") not in processed_ids:
+                summary.gov_edits.append(change)
+
+    if all_utc:
+        summary.ts_min = parse_timestamp(ts_min)
+        summary.ts_max = parse_timestamp(ts_max)
+        return summary
+
+    # Some timestamps aren't in the usual form, so compare them parsed instead
+    parsed = []
+    for change in changes:
+        try:
+            dt = parse_timestamp(change.get("timestamp"))
+        except (TypeError, ValueError, AttributeError):
+            logging.warning(f"Skipping unparseable timestamp {change.get('timestamp')!r} "
+                            f"(rcid {change.get('rcid')}) in date range")
             continue
+        parsed.append(dt if dt.tzinfo else dt.replace(tzinfo=timezone.utc))
+    if parsed:
+        summary.ts_min = min(parsed)
+        summary.ts_max = max(parsed)
+    return summary
+
+
+def filter_government_change(change: Dict, ip_cache, processed_ids=None) -> Optional[Dict]:
+    """
+    Check a single change against government IPs
+
+    The change is annotated (see annotate_change) if it hasn't been already,
+    so callers can read the matched organization from change["_org"].
+
+    Args:
+        change: Wikipedia change dictionary
+        ip_cache: IPNetworkCache instance for IP matching
+        processed_ids: Optional set of already processed rcids to skip
+
+    Returns:
+        The change if it is an unprocessed government edit, otherwise None
+    """
+    # Skip if already processed
+    if processed_ids is not None and change.get("rcid") in processed_ids:
+        return None
+
+    # Reuse an earlier annotation when the batch was already summarized
+    if "_gov" not in change:
+        annotate_change(change, ip_cache)
+    return change if change["_gov"] else None
 
-        user = change.get("user", "")
-        if is_ip_address(user):
-            is_gov, org = ip_cache.check_ip(user)
-            if is_gov:
-                government_changes.append(change)
 
-    return government_changes
+def filter_government_changes(changes: List[Dict], ip_cache, processed_ids: set = None) -> List[Dict]:
+    """
+    Filter changes to only those from government IPs
+
+    Changes are annotated (see annotate_change) as they are checked, so
+    callers can read the matched organization from change["_org"].
+
+    Args:
+        changes: List of Wikipedia change dictionaries
+        ip_cache: IPNetworkCache instance for IP matching
+        processed_ids: Optional set of already processed rcids to skip
+
+    Returns:
+        Filtered list containing only government edits
+    """
+    return [change for change in changes if filter_government_change(change, ip_cache, processed_ids)]
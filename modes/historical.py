@@ -1,31 +1,56 @@
 """
 Historical Wikipedia scanning mode
 """
-import json
 import logging
 import os
+import queue
+import struct
+import sys
+import threading
 import time
+from array import array
 from collections import deque
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Tuple
 import colorama
+import orjson
 import requests
-from dateutil import parser
 
 from core.ip_matcher import IPNetworkCache
-from core.scanner import filter_government_changes
-from processors.screenshot import take_screenshot, create_diff_url
-from processors.csv_handler import save_to_csv
+from core.scanner import create_session, summarize_changes
+from processors.screenshot import AsyncScreenshotPool, take_screenshot, create_diff_url
+from processors.csv_handler import CSVOutput
 from processors.bluesky_poster import post_to_bluesky, load_bluesky_credentials
 from atproto import Client, models
-from utils.helpers import convert_timestamp
+from utils.helpers import parse_timestamp
 from utils.logging_config import setup_logging
-from config.settings import DEFAULT_DAYS_TO_FETCH, DEFAULT_FILTER, API_DELAY, BLUESKY_DELAY
+from config.settings import (
+    DEFAULT_DAYS_TO_FETCH, DEFAULT_FILTER, API_DELAY, BLUESKY_BATCH_SIZE,
+    CSV_BATCH_SIZE, SCREENSHOT_WORKERS, WIKIPEDIA_API_URL, WIKIPEDIA_RC_PARAMS,
+    WIKIPEDIA_BOT_ACCOUNT, WIKIPEDIA_BOT_RCLIMIT, WIKIPEDIA_MIN_RCLIMIT,
+)
 
 STATE_FILE = "catchup_state.json"
+RCIDS_FILE = "catchup_state.rcids.bin"
 OUTPUT_CSV = "historical_government_changes.csv"
 SENSITIVE_CSV = "historical_sensitive_changes.csv"
 LOG_FILE = "wikipedia_catchup.log"
+DEAD_LETTER_FILE = "historical_dead_letters.jsonl"
+MAX_ATTEMPTS = 5  # Failed queue items are retried with 2**attempts second backoff
+
+# Government edit log entry, colored once up front instead of per edit
+_FORE, _RESET = colorama.Fore, colorama.Style.RESET_ALL
+_EDIT_TEMPLATE = (
+    f"{_FORE.CYAN}📌 Title: {_RESET}{{title}}\n"
+    f"{_FORE.MAGENTA}🖥️ IP: {_RESET}{{ip}}\n"
+    f"{_FORE.GREEN}🏢 Organization: {_RESET}{{org}}\n"
+    f"{_FORE.YELLOW}⏰ Time: {_RESET}{{time}}\n"
+    f"{_FORE.BLUE}💬 Comment: {_RESET}{{comment}}..."
+)
+
+# Processed rcids are appended to RCIDS_FILE as big-endian uint64 records
+_RCID = struct.Struct('>Q')
 
 
 class HistoricalProcessor:
@@ -40,6 +65,10 @@ class HistoricalProcessor:
         self.filter_level = filter_level
         self.days_to_fetch = days_to_fetch
         self.ip_cache = IPNetworkCache(filter_level=filter_level)
+        self.http = create_session()
+        self.max_rclimit = WIKIPEDIA_BOT_RCLIMIT if WIKIPEDIA_BOT_ACCOUNT else WIKIPEDIA_RC_PARAMS["rclimit"]
+        self.rclimit = self.max_rclimit
+        self._state_lock = threading.Lock()
         self.state = self.load_state()
 
         # Validate state consistency
@@ -47,8 +76,18 @@ class HistoricalProcessor:
             logging.warning("Invalid state: continuation token without timestamp")
             self.state["continue_token"] = None
 
-        self.queue = deque(self.state["queue"]) if isinstance(self.state["queue"], list) else self.state["queue"]
+        # Items captured (and marked processed) before a crash are not replayed
+        self.queue = deque(item for item in self.state["queue"] if not self._is_processed(item))
+        self.dead_q = deque()
         self.bluesky_client = self.init_bluesky()
+        self._rcids_fh = self._open_rcids_log()
+        self.csv = CSVOutput(OUTPUT_CSV, SENSITIVE_CSV)
+
+        # CSV rows and state snapshots are written by a background thread
+        self.writer_q = queue.Queue(maxsize=256)
+        self._writer = threading.Thread(target=self._writer_loop, daemon=True)
+        self._writer.start()
+        self.screenshots = self.init_screenshots()
 
     def init_bluesky(self):
         """Initialize Bluesky client if enabled"""
@@ -64,21 +103,31 @@ class HistoricalProcessor:
             logging.error(f"Bluesky init failed: {e}")
             return None
 
+    def init_screenshots(self):
+        """Start the shared screenshot browser, or fall back to per-capture launches"""
+        try:
+            return AsyncScreenshotPool(size=SCREENSHOT_WORKERS)
+        except Exception as e:
+            logging.warning(f"Screenshot pool unavailable, launching a browser per capture: {e}")
+            return None
+
     def load_state(self) -> Dict:
         """Load processing state from file"""
+        processed_rcids = self._load_rcids()
         default_state = {
             "last_timestamp": None,
-            "processed_rcids": set(),
+            "processed_rcids": processed_rcids,
             "continue_token": None,
             "queue": []
         }
 
         try:
-            with open(STATE_FILE, 'r') as f:
-                state = json.load(f)
+            with open(STATE_FILE, 'rb') as f:
+                state = orjson.loads(f.read())
                 loaded_state = {
                     "last_timestamp": state.get("last_timestamp"),
-                    "processed_rcids": set(state.get("processed_rcids", [])),
+                    # Older state files kept the rcids inline as strings
+                    "processed_rcids": processed_rcids | {int(r) for r in state.get("processed_rcids", [])},
                     "continue_token": state.get("continue_token"),
                     "queue": deque(state.get("queue", []))
                 }
@@ -86,7 +135,7 @@ class HistoricalProcessor:
                 # Validate timestamp format
                 if loaded_state["last_timestamp"]:
                     try:
-                        parser.isoparse(loaded_state["last_timestamp"])
+                        parse_timestamp(loaded_state["last_timestamp"])
                     except:
                         logging.warning("Invalid timestamp in state, resetting")
                         loaded_state["last_timestamp"] = None
@@ -103,52 +152,154 @@ class HistoricalProcessor:
             logging.error(f"State load error: {e}")
             return default_state
 
+    @staticmethod
+    def _load_rcids() -> set:
+        """Read processed rcids from the append-only sidecar file"""
+        try:
+            with open(RCIDS_FILE, 'rb') as f:
+                data = f.read()
+        except FileNotFoundError:
+            return set()
+
+        # Drop a partial record left behind by an interrupted append
+        data = data[:len(data) - len(data) % _RCID.size]
+        return set(HistoricalProcessor._unpack_rcids(data))
+
+    @staticmethod
+    def _unpack_rcids(data: bytes) -> array:
+        """Decode big-endian uint64 records into a packed array in one call"""
+        rcids = array('Q')
+        rcids.frombytes(data)
+        if sys.byteorder == 'little':
+            rcids.byteswap()
+        return rcids
+
+    @staticmethod
+    def _pack_rcids(rcids) -> bytes:
+        """Encode rcids as big-endian uint64 records"""
+        packed = array('Q', rcids)
+        if sys.byteorder == 'little':
+            packed.byteswap()
+        return packed.tobytes()
+
+    def _open_rcids_log(self):
+        """Compact the rcid sidecar to the current set and reopen it for appends"""
+        rcids = sorted(self.state["processed_rcids"])
+        tmp_file = RCIDS_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(self._pack_rcids(rcids))
+        os.replace(tmp_file, RCIDS_FILE)
+        return open(RCIDS_FILE, 'ab', buffering=1 << 16)
+
+    def mark_processed(self, rcid: int):
+        """Record an rcid in memory and append it to the sidecar file"""
+        with self._state_lock:
+            if rcid in self.state["processed_rcids"]:
+                return
+            self.state["processed_rcids"].add(rcid)
+            self._rcids_fh.write(_RCID.pack(rcid))
+            self._rcids_fh.flush()
+
+    def _is_processed(self, item: Dict) -> bool:
+        """Check whether a queue item's rcid has already been marked processed"""
+        rcid = item["data"].get("rcid")
+        return bool(rcid) and int(rcid) in self.state["processed_rcids"]
+
+    @staticmethod
+    def _persistable(item: Dict) -> Dict:
+        """Drop cached underscore fields (e.g. parsed datetimes) from a queue item"""
+        data = {k: v for k, v in item["data"].items() if not k.startswith("_")}
+        return {**item, "data": data}
+
     def save_state(self):
-        """Save processing state to file"""
+        """Snapshot processing state and hand it to the writer thread
+
+        processed_rcids are not part of the JSON; they are appended to
+        RCIDS_FILE as they are added, so only that buffer is flushed here.
+        """
+        with self._state_lock:
+            self._rcids_fh.flush()
         state = {
             "last_timestamp": self.state["last_timestamp"],
-            "processed_rcids": list(self.state["processed_rcids"]),
             "continue_token": self.state["continue_token"],
-            "queue": list(self.queue)
+            # Captured items stay in self.queue until the main thread pops them
+            "queue": [self._persistable(item) for item in self.queue if not self._is_processed(item)]
         }
-
-        with open(STATE_FILE, 'w') as f:
-            json.dump(state, f)
+        self.writer_q.put(("state", state))
+
+    def _writer_loop(self):
+        """Write queued CSV batches and state snapshots in order until a None sentinel"""
+        while True:
+            task = self.writer_q.get()
+            if task is None:
+                return
+            kind, payload = task
+            try:
+                if kind == "csv":
+                    self.csv.save_rows(payload, self.ip_cache)
+                else:
+                    self._write_state(payload)
+            except Exception as e:
+                logging.error(f"Failed to write {kind}: {e}")
+
+    def close_writer(self):
+        """Drain pending writes and stop the writer thread"""
+        if self._writer.is_alive():
+            self.writer_q.put(None)
+            self._writer.join()
+
+    @staticmethod
+    def _write_state(state: Dict):
+        """Write a state snapshot to STATE_FILE"""
+        # Write to a temp file and rename so a crash never leaves a torn state file
+        tmp_file = STATE_FILE + ".tmp"
+        with open(tmp_file, 'wb') as f:
+            f.write(orjson.dumps(state))
+        os.replace(tmp_file, STATE_FILE)
 
     def fetch_historical_changes(self) -> Tuple[List[Dict], str]:
-        """Fetch changes from Wikipedia API"""
+        """
+        Fetch changes from Wikipedia API
+
+        Pages with the stored rccontinue token so the server resumes exactly
+        after the last returned row; rcstart from last_timestamp is only used
+        on a cold start or when the API rejects the token. The page size is
+        halved after a timeout and grows back after successful fetches.
+        """
         params = {
             "action": "query",
             "list": "recentchanges",
             "rcprop": "title|ids|sizes|flags|user|timestamp|comment|revid|parentid",
             "rcshow": "!bot",
-            "rclimit": 500,
+            "rclimit": self.rclimit,
             "format": "json",
             "rcdir": "newer",
-            "rcend": datetime.now(timezone.utc).isoformat(),
+            "rcend": time.strftime("%Y%m%d%H%M%S", time.gmtime()),  # MediaWiki TS_MW format
         }
 
         # Use continuation token if available, otherwise use timestamp
         if self.state["continue_token"]:
             params["rccontinue"] = self.state["continue_token"]
         else:
-            params["rcstart"] = (parser.isoparse(self.state["last_timestamp"])
+            params["rcstart"] = (parse_timestamp(self.state["last_timestamp"])
                     if self.state["last_timestamp"]
                     else datetime.now(timezone.utc) - timedelta(days=self.days_to_fetch)).isoformat()
 
-        headers = {
-            'User-Agent': 'GovEditsBot/1.0 (Wikipedia government edit monitor; educational/transparency project)'
-        }
-
         try:
-            response = requests.get(
-                "https://en.wikipedia.org/w/api.php",
-                params=params,
-                headers=headers,
-                timeout=60
-            )
+            response = self.http.get(WIKIPEDIA_API_URL, params=params, timeout=60)
             response.raise_for_status()
-            data = response.json()
+            data = orjson.loads(response.content)
+
+            error = data.get("error")
+            if error:
+                if "rccontinue" in params:
+                    logging.warning(
+                        f"Continuation token rejected ({error.get('code')}), "
+                        f"resuming from last timestamp"
+                    )
+                    self.state["continue_token"] = None
+                    return self.fetch_historical_changes()
+                raise RuntimeError(f"API error {error.get('code')}: {error.get('info')}")
 
             changes = data.get("query", {}).get("recentchanges", [])
             continue_token = data.get("continue", {}).get("rccontinue")
@@ -156,25 +307,25 @@ class HistoricalProcessor:
             if changes:
                 logging.info(f"🌐 Fetched {len(changes)} changes")
 
+            self.rclimit = min(self.rclimit * 2, self.max_rclimit)
+
             return changes, continue_token
 
         except requests.exceptions.Timeout as e:
             logging.error(f"⏳ Timeout fetching changes: {e}")
-            self.state["continue_token"] = None
+            self.rclimit = max(self.rclimit // 2, WIKIPEDIA_MIN_RCLIMIT)
+            logging.info(f"Reduced page size to {self.rclimit} changes")
             self.save_state()
             raise
 
         except requests.exceptions.RequestException as e:
             logging.error(f"🌐 Network error: {e}")
-            self.state["continue_token"] = None
             self.save_state()
             raise
 
         except Exception as e:
             logging.error(f"❌ Unexpected error: {e}")
-            if 'last_timestamp' in self.state:
-                self.state["continue_token"] = None
-                self.save_state()
+            self.save_state()
             raise
 
     def process_changes(self, changes: List[Dict]):
@@ -182,13 +333,27 @@ class HistoricalProcessor:
         if not changes:
             return
 
+        # Annotate, count and filter in a single pass over the batch
+        summary = summarize_changes(changes, self.ip_cache, self.state["processed_rcids"])
+        start, end = summary.ts_min, summary.ts_max
+        gov_edits = summary.gov_edits
+
+        date_range = (f"from {start.strftime('%Y-%m-%d %H:%M')} to {end.strftime('%Y-%m-%d %H:%M')}"
+                      if end else "with no parseable timestamps")
         logging.info(
-            f"{colorama.Fore.CYAN}📅 Processing {len(changes)} changes"
+            f"{colorama.Fore.CYAN}📅 Processing {summary.total} changes {date_range}"
             f"{colorama.Style.RESET_ALL}"
         )
-
-        # Filter government edits
-        gov_edits = filter_government_changes(changes, self.ip_cache, self.state["processed_rcids"])
+        logging.info(
+            f"{colorama.Fore.MAGENTA}📊 User Statistics:{colorama.Style.RESET_ALL}\n"
+            f"  • IP Address Edits: {colorama.Fore.YELLOW}{summary.ip_count}{colorama.Style.RESET_ALL}\n"
+            f"  • Logged-in User Edits: {colorama.Fore.YELLOW}{summary.total - summary.ip_count}{colorama.Style.RESET_ALL}"
+        )
+        if logging.getLogger().isEnabledFor(logging.DEBUG):
+            logging.debug("Sample changes (first 3):")
+            for i, change in enumerate(summary.samples):
+                user_type = "IP" if change["_is_ip"] else "Logged-in"
+                logging.debug(f"  {i+1}. {change.get('title', '')} ({user_type}: {change['_user']})")
 
         if gov_edits:
             self.log_government_edits(gov_edits)
@@ -203,79 +368,169 @@ class HistoricalProcessor:
             )
 
         # Add government edits to processing queue
-        for edit in gov_edits:
-            self.queue.append({
-                "data": edit,
-                "screenshot": None,
-                "posted": False
-            })
+        self.queue.extend(
+            {"data": edit, "org": edit["_org"], "screenshot": None, "posted": False}
+            for edit in gov_edits
+        )
 
         # Note: processed_rcids will be updated in process_queue() after successful processing
         # Update timestamp based on ALL changes in batch (not just government edits)
-        if changes:
-            timestamps = [parser.isoparse(c['timestamp']) for c in changes]
-            self.state["last_timestamp"] = max(timestamps).isoformat()
+        if end:
+            self.state["last_timestamp"] = end.isoformat()
 
-    def process_queue(self):
-        """Process queued changes"""
-        total_processed = 0
-        while self.queue:
-            item = self.queue.popleft()
+    def _capture_item(self, item: Dict) -> str:
+        """
+        Screenshot and mark one queue item processed (runs on a worker thread)
 
-            try:
-                # Take screenshot
-                if not item["screenshot"]:
-                    diff_url = create_diff_url(
-                        item["data"]["revid"],
-                        item["data"].get("parentid")
-                    )
-                    item["screenshot"] = take_screenshot(
-                        diff_url,
-                        item["data"]["title"],
-                        item["data"]["timestamp"]
-                    )
+        Args:
+            item: Queue item dictionary (updated in place)
 
-                # Mark as processed FIRST to prevent duplicates on crash
-                rcid = str(item["data"].get("rcid", ""))
-                if rcid:
-                    self.state["processed_rcids"].add(rcid)
+        Returns:
+            Organization name for the edit
+        """
+        if not item["screenshot"]:
+            diff_url = create_diff_url(
+                item["data"]["revid"],
+                item["data"].get("parentid")
+            )
+            capture = self.screenshots.take_screenshot if self.screenshots else take_screenshot
+            item["screenshot"] = capture(
+                diff_url,
+                item["data"]["title"],
+                item["data"]["timestamp"]
+            )
+
+        # Mark as processed once captured; save_state and process_queue skip
+        # marked items, so a crash never replays them
+        rcid = item["data"].get("rcid")
+        if rcid:
+            self.mark_processed(int(rcid))
+
+        # Items queued before the org was stored need one lookup
+        return item.get("org") or self.ip_cache.check_ip(item["data"].get("user"))[1]
+
+    def _post_worker(self, post_q: queue.Queue):
+        """Drain captured items to Bluesky in batches until a None sentinel arrives"""
+        done = False
+        while not done:
+            batch = [post_q.get()]
+            while len(batch) < BLUESKY_BATCH_SIZE and not post_q.empty():
+                batch.append(post_q.get())
+            if batch[-1] is None:
+                batch.pop()
+                done = True
+            if not batch:
+                continue
+
+            post_to_bluesky([post for post, _ in batch], client=self.bluesky_client)
+            for _, item in batch:
                 item["posted"] = True
 
-                # Save state immediately to prevent reprocessing
-                self.save_state()
+    def process_queue(self):
+        """
+        Process queued changes
+
+        Screenshots run on a small thread pool while a single poster thread
+        sends finished items to Bluesky, so rendering and network work
+        overlap. CSV rows are handed to the writer thread in batches of
+        CSV_BATCH_SIZE. Items leave the queue in order as their capture
+        completes. A failed item goes to the back with an exponential backoff
+        and is retried once due; after MAX_ATTEMPTS it is moved to the
+        dead-letter file.
+        """
+        # Drop items already marked processed (e.g. captured before a crash)
+        self.queue = deque(item for item in self.queue if not self._is_processed(item))
+        if not self.queue:
+            return
 
-                # Save to CSV
-                save_to_csv([item["data"]], self.ip_cache, OUTPUT_CSV, SENSITIVE_CSV, item["screenshot"])
+        # Only items whose backoff has elapsed are processed; they go first
+        now = time.time()
+        items = [item for item in self.queue if item.get("next_try", 0) <= now]
+        if not items:
+            return
+        waiting = [item for item in self.queue if item.get("next_try", 0) > now]
+        self.queue = deque(items + waiting)
 
-                # Post to Bluesky (safe to fail now - won't retry)
-                if self.bluesky_client:
-                    _, org = self.ip_cache.check_ip(item["data"].get("user"))
-                    formatted_change = {
-                        "title": item["data"].get("title"),
-                        "organization": org,
-                        "screenshot_path": item["screenshot"],
-                        "change_data": item["data"]
-                    }
-                    post_to_bluesky([formatted_change])
-                    time.sleep(BLUESKY_DELAY)
+        total_processed = 0
+        csv_rows = []
 
-                total_processed += 1
+        post_q = queue.Queue()
+        poster = None
+        if self.bluesky_client:
+            poster = threading.Thread(target=self._post_worker, args=(post_q,), daemon=True)
+            poster.start()
 
-            except Exception as e:
-                logging.error(f"Queue item failed: {e}")
-                self.queue.appendleft(item)
-                break
-
-            if total_processed % 10 == 0:
-                logging.info(
-                    f"{colorama.Fore.CYAN}📦 Queue progress: "
-                    f"Processed {total_processed} items, {len(self.queue)} remaining"
-                    f"{colorama.Style.RESET_ALL}"
-                )
-
-            # Update state periodically
-            if total_processed % 10 == 0:
-                self.save_state()
+        try:
+            with ThreadPoolExecutor(max_workers=SCREENSHOT_WORKERS) as pool:
+                futures = [pool.submit(self._capture_item, item) for item in items]
+
+                try:
+                    for item, future in zip(items, futures):
+                        try:
+                            org = future.result()
+                        except Exception as e:
+                            self._retry_or_dead_letter(self.queue.popleft(), e)
+                            continue
+
+                        self.queue.popleft()
+                        total_processed += 1
+
+                        csv_rows.append((item["data"], item["screenshot"], org))
+                        if len(csv_rows) >= CSV_BATCH_SIZE:
+                            self.writer_q.put(("csv", csv_rows))
+                            csv_rows = []
+
+                        if poster:
+                            post_q.put(({
+                                "title": item["data"].get("title"),
+                                "organization": org,
+                                "screenshot_path": item["screenshot"],
+                                "change_data": item["data"]
+                            }, item))
+                        else:
+                            item["posted"] = True
+
+                        if total_processed % 10 == 0:
+                            logging.info(
+                                f"{colorama.Fore.CYAN}📦 Queue progress: "
+                                f"Processed {total_processed} items, {len(self.queue)} remaining"
+                                f"{colorama.Style.RESET_ALL}"
+                            )
+
+                            # Update state periodically
+                            self.save_state()
+                except KeyboardInterrupt:
+                    # Don't wait for the remaining captures on shutdown
+                    pool.shutdown(wait=False, cancel_futures=True)
+                    raise
+        finally:
+            if csv_rows:
+                self.writer_q.put(("csv", csv_rows))
+            if poster:
+                post_q.put(None)
+                poster.join()
+
+    def _retry_or_dead_letter(self, item: Dict, error: Exception):
+        """Schedule a failed queue item for retry, or dead-letter it after MAX_ATTEMPTS"""
+        item["attempts"] = item.get("attempts", 0) + 1
+        if item["attempts"] < MAX_ATTEMPTS:
+            delay = 2 ** item["attempts"]
+            item["next_try"] = time.time() + delay
+            self.queue.append(item)
+            logging.error(f"Queue item failed (attempt {item['attempts']}), retrying in {delay}s: {error}")
+            return
+
+        self.dead_q.append(item)
+        logging.error(f"Queue item failed {item['attempts']} times, moving to {DEAD_LETTER_FILE}: {error}")
+        with open(DEAD_LETTER_FILE, 'ab') as f:
+            f.write(orjson.dumps({**self._persistable(item), "error": str(error)}) + b"\n")
+
+    def drain_retries(self):
+        """Wait out pending backoffs until every queued item is done or dead-lettered"""
+        while self.queue:
+            next_try = min(item.get("next_try", 0) for item in self.queue)
+            time.sleep(max(0, next_try - time.time()))
+            self.process_queue()
 
     def log_government_edits(self, gov_edits: List[Dict]):
         """Log government edits with formatting"""
@@ -284,17 +539,13 @@ class HistoricalProcessor:
 
         logging.info("\n🚨🚨🚨 HISTORICAL GOVERNMENT EDIT DETECTED 🚨🚨🚨")
         for change in gov_edits:
-            ip = change.get('user', '')
-            is_gov, org = self.ip_cache.check_ip(ip)
-            timestamp = parser.isoparse(change.get('timestamp', '')).strftime('%Y-%m-%d %H:%M:%S')
-
-            logging.info(
-                f"{colorama.Fore.CYAN}📌 Title: {colorama.Style.RESET_ALL}{change.get('title', '')}\n"
-                f"{colorama.Fore.MAGENTA}🖥️ IP: {colorama.Style.RESET_ALL}{ip}\n"
-                f"{colorama.Fore.GREEN}🏢 Organization: {colorama.Style.RESET_ALL}{org}\n"
-                f"{colorama.Fore.YELLOW}⏰ Time: {colorama.Style.RESET_ALL}{timestamp}\n"
-                f"{colorama.Fore.BLUE}💬 Comment: {colorama.Style.RESET_ALL}{change.get('comment', '')[:100]}..."
-            )
+            logging.info(_EDIT_TEMPLATE.format_map({
+                "title": change.get('title', ''),
+                "ip": change['_user'],
+                "org": change['_org'],
+                "time": change['_ts'].strftime('%Y-%m-%d %H:%M:%S'),
+                "comment": change.get('comment', '')[:100],
+            }))
         logging.info("🔔🔔🔔 END OF GOVERNMENT ALERT 🔔🔔🔔\n")
 
     def run(self):
@@ -314,14 +565,24 @@ class HistoricalProcessor:
 
             # Main processing loop
             while True:
-                changes, continue_token = self.fetch_historical_changes()
-                self.state["continue_token"] = continue_token
+                rclimit = self.rclimit
+                try:
+                    changes, continue_token = self.fetch_historical_changes()
+                except requests.exceptions.Timeout:
+                    # Retry with the smaller page; give up once a minimum-size page times out too
+                    if rclimit > WIKIPEDIA_MIN_RCLIMIT:
+                        time.sleep(API_DELAY)
+                        continue
+                    raise
 
                 if not changes:
                     logging.info("✅ No more changes found")
                     break
 
+                # Advance the token together with last_timestamp so any
+                # save in between never pairs a new token with an old time
                 self.process_changes(changes)
+                self.state["continue_token"] = continue_token
                 self.process_queue()
                 self.save_state()
 
@@ -329,7 +590,7 @@ class HistoricalProcessor:
 
                 # Progress logging
                 if self.state["last_timestamp"]:
-                    processed_time = parser.isoparse(self.state["last_timestamp"])
+                    processed_time = parse_timestamp(self.state["last_timestamp"])
                     time_diff = datetime.now(timezone.utc) - processed_time
                     logging.info(f"⏳ Processed up to {processed_time} ({time_diff.days} days remaining)")
 
@@ -337,9 +598,15 @@ class HistoricalProcessor:
                 if continue_token is None:
                     break
 
-            # Cleanup
-            if os.path.exists(STATE_FILE):
-                os.remove(STATE_FILE)
+            # Finish retries before the state (and its queue) is removed
+            self.drain_retries()
+
+            # Cleanup (after pending writes, so no late state write recreates the file)
+            self.close_writer()
+            self._rcids_fh.close()
+            for path in (STATE_FILE, RCIDS_FILE):
+                if os.path.exists(path):
+                    os.remove(path)
 
             logging.info(
                 f"{colorama.Fore.GREEN}✅ Historical processing complete! "
@@ -353,6 +620,11 @@ class HistoricalProcessor:
         except Exception as e:
             logging.error(f"Fatal error: {e}")
             self.save_state()
+        finally:
+            self.close_writer()
+            self.csv.close()
+            if self.screenshots:
+                self.screenshots.close()
 
 
 def run_historical_scan(filter_level: str = DEFAULT_FILTER, days: int = DEFAULT_DAYS_TO_FETCH):
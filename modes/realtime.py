@@ -2,23 +2,52 @@
 Real-time Wikipedia monitoring mode
 """
 import logging
+import sys
 import time
-import colorama
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from core.ip_matcher import IPNetworkCache
 from core.scanner import fetch_recent_changes, filter_government_changes
-from processors.screenshot import take_screenshot, create_diff_url
-from processors.csv_handler import save_to_csv
-from processors.bluesky_poster import post_to_bluesky
-from utils.helpers import load_state, save_state, convert_timestamp
+from processors.screenshot import create_diff_url
+from processors.csv_handler import init_csv_files
+from processors.alerts import save_and_post_changes, finish_media
+from utils.helpers import BoundedSet, clock_str, load_state, save_state, convert_timestamp
+from utils.display import (
+    FORE, RESET, BANNER_TOP, BANNER_DIVIDER, BANNER_BOTTOM, ALERT_BOX, SHUTDOWN_BOX,
+    banner_row, print_change,
+)
 from utils.logging_config import setup_logging
-from config.settings import REALTIME_POLL_INTERVAL, DEFAULT_FILTER
+from config.settings import REALTIME_POLL_INTERVAL, STATUS_REFRESH_INTERVAL, STATE_SAVE_INTERVAL, DEFAULT_FILTER
 
 STATE_FILE = "last_run_state.json"
 OUTPUT_CSV = "government_changes.csv"
 SENSITIVE_CSV = "sensitive_content_changes.csv"
 LOG_FILE = "wikipedia_monitor.log"
 
+# Fetches the next continuation page while the current one is filtered
+FETCH_EXECUTOR = ThreadPoolExecutor(max_workers=1)
+
+
+def _rc_params(last_timestamp: str = None, continue_token: str = None) -> dict:
+    """Build recentchanges query parameters for one realtime page"""
+    params = {
+        "action": "query",
+        "list": "recentchanges",
+        "rcprop": "title|ids|sizes|flags|user|timestamp|comment|revid|parentid",
+        "rcshow": "!bot",
+        "rclimit": 500,
+        "format": "json",
+        "rcdir": "newer",
+    }
+
+    if last_timestamp:
+        params["rcstart"] = last_timestamp
+
+    if continue_token:
+        params["rccontinue"] = continue_token
+
+    return params
+
 
 def run_realtime_monitor(filter_level: str = DEFAULT_FILTER):
     """
@@ -30,204 +59,144 @@ def run_realtime_monitor(filter_level: str = DEFAULT_FILTER):
     setup_logging(LOG_FILE)
 
     total_changes = 0
-    processed_changes = set()
+    processed_changes = BoundedSet()
     ip_cache = IPNetworkCache(filter_level=filter_level)
+    init_csv_files(OUTPUT_CSV, SENSITIVE_CSV)
 
     logging.info(f"Loaded {len(ip_cache.networks['v4'])} IPv4 ranges and {len(ip_cache.networks['v6'])} IPv6 ranges")
 
     last_timestamp = load_state(STATE_FILE)
+    saved_timestamp = last_timestamp
+    last_state_save = 0.0
 
     # Spinner animation frames
     spinner_frames = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
     spinner_idx = 0
+    last_status_draw = 0.0
 
     # Enhanced terminal display with box drawing
     # Note: emoji 📡 takes 2 character widths, so adjust spacing accordingly
-    print(f"\n{colorama.Fore.CYAN}╔{'═'*58}╗{colorama.Style.RESET_ALL}")
-    print(f"{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL} 📡 Wikipedia Government Edit Monitor{' '*21}{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL}")
-    print(f"{colorama.Fore.CYAN}╠{'═'*58}╣{colorama.Style.RESET_ALL}")
-
-    filter_text = f"Filter: {filter_level}"
-    filter_padding = 58 - len(filter_text) - 1
-    print(f"{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}{filter_text}{colorama.Style.RESET_ALL}{' '*filter_padding}{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL}")
+    print(BANNER_TOP)
+    print(f"{FORE.CYAN}║{RESET} 📡 Wikipedia Government Edit Monitor{' '*21}{FORE.CYAN}║{RESET}")
+    print(BANNER_DIVIDER)
+    print(banner_row(f"Filter: {filter_level}"))
+    print(banner_row(f"Ranges: {len(ip_cache.networks['v4'])} IPv4 + {len(ip_cache.networks['v6'])} IPv6"))
 
-    ranges_text = f"Ranges: {len(ip_cache.networks['v4'])} IPv4 + {len(ip_cache.networks['v6'])} IPv6"
-    ranges_padding = 58 - len(ranges_text) - 1
-    print(f"{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}{ranges_text}{colorama.Style.RESET_ALL}{' '*ranges_padding}{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL}")
-
-    print(f"{colorama.Fore.CYAN}╚{'═'*58}╝{colorama.Style.RESET_ALL}\n")
+    print(f"{BANNER_BOTTOM}\n")
 
     logging.info("Starting indefinite polling for government changes...")
 
+    # Polls are scheduled against a fixed cadence so processing time doesn't
+    # stretch the interval; after an overrun the schedule restarts from now
+    next_poll = time.monotonic()
+
     try:
         while True:
             try:
-                # Update timestamps for this iteration
-                current_time_utc = datetime.now(timezone.utc)
-
-                # Fetch all changes using continuation if needed
+                # Fetch all changes using continuation if needed. The next page
+                # is requested before the current one is filtered, so IP
+                # matching overlaps the network round trip.
                 all_changes = []
-                continue_token = None
+                government_changes = []
                 batch_count = 0
 
-                while True:
-                    params = {
-                        "action": "query",
-                        "list": "recentchanges",
-                        "rcprop": "title|ids|sizes|flags|user|timestamp|comment|revid|parentid",
-                        "rcshow": "!bot",
-                        "rclimit": 500,
-                        "format": "json",
-                        "rcdir": "newer",
-                        "rcend": current_time_utc.isoformat()
-                    }
-
-                    if last_timestamp:
-                        params["rcstart"] = last_timestamp
+                logging.debug("Fetching batch 1 from %s to now", last_timestamp or 'beginning')
+                pending = FETCH_EXECUTOR.submit(fetch_recent_changes, _rc_params(last_timestamp))
 
-                    if continue_token:
-                        params["rccontinue"] = continue_token
-
-                    logging.debug(f"Fetching batch {batch_count + 1} from {last_timestamp or 'beginning'} to {params['rcend']}")
-
-                    data = fetch_recent_changes(params)
+                while pending:
+                    data = pending.result()
+                    pending = None
                     changes = data.get("query", {}).get("recentchanges", [])
-                    all_changes.extend(changes)
                     batch_count += 1
 
-                    # Check if there are more results
+                    # Check if there are more results (a partial batch is the last one)
                     continue_token = data.get("continue", {}).get("rccontinue")
+                    if continue_token and len(changes) >= 500:
+                        logging.debug("Found continuation token - fetching batch %d", batch_count + 1)
+                        pending = FETCH_EXECUTOR.submit(
+                            fetch_recent_changes, _rc_params(last_timestamp, continue_token)
+                        )
 
-                    if not continue_token or len(changes) < 500:
-                        # No more results or last batch was partial
-                        break
-
-                    # Log continuation
-                    logging.debug(f"Found continuation token - fetching more results (total so far: {len(all_changes)})")
+                    all_changes.extend(changes)
+                    government_changes.extend(filter_government_changes(changes, ip_cache, processed_changes))
 
                 # Log sample changes to file only
-                if all_changes:
-                    logging.debug(f"Fetched {len(all_changes)} total changes in {batch_count} batch(es)")
-                    logging.debug(f"Sample changes (showing first 3):")
+                if all_changes and logging.getLogger().isEnabledFor(logging.DEBUG):
+                    logging.debug("Fetched %d total changes in %d batch(es)", len(all_changes), batch_count)
+                    logging.debug("Sample changes (showing first 3):")
                     for i, change in enumerate(all_changes[:3]):
-                        logging.debug(f"Change {i+1}: Title={change.get('title')}, User={change.get('user')}")
-
-                government_changes = filter_government_changes(all_changes, ip_cache, processed_changes)
-
-                # Update spinner for visual feedback
-                spinner = spinner_frames[spinner_idx % len(spinner_frames)]
-                spinner_idx += 1
+                        logging.debug("Change %d: Title=%s, User=%s", i + 1, change.get('title'), change.get('user'))
 
                 if government_changes:
                     # Clear the polling line and show alerts
                     print(f"\r{' '*80}\r", end="")  # Clear line
-                    print(f"\n{colorama.Fore.RED}╔{'═'*58}╗{colorama.Style.RESET_ALL}")
-                    print(f"{colorama.Fore.RED}║{colorama.Style.RESET_ALL} {colorama.Fore.RED}🚨 GOVERNMENT EDIT DETECTED{colorama.Style.RESET_ALL}{' '*26}{colorama.Fore.RED}║{colorama.Style.RESET_ALL}")
-                    print(f"{colorama.Fore.RED}╚{'═'*58}╝{colorama.Style.RESET_ALL}\n")
+                    print(ALERT_BOX)
+                    logging.info("GOVERNMENT EDIT DETECTED")
 
+                    # Display and log each change from the same computed fields
                     for change in government_changes:
-                        _, org = ip_cache.check_ip(change.get("user"))
                         timestamp_str = convert_timestamp(change.get('timestamp'))
-
-                        # Determine org color based on type
-                        org_lower = org.lower()
-                        if any(x in org_lower for x in ['senate', 'house of representatives', 'congress']):
-                            org_color = colorama.Fore.MAGENTA
-                        elif any(x in org_lower for x in ['department', 'white house', 'executive']):
-                            org_color = colorama.Fore.BLUE
-                        elif 'court' in org_lower:
-                            org_color = colorama.Fore.CYAN
-                        else:
-                            org_color = colorama.Fore.YELLOW
-
-                        # Create clickable link (works in modern terminals)
-                        diff_url = create_diff_url(change.get("revid"), change.get("parentid"))
-                        clickable_url = f"\033]8;;{diff_url}\033\\{diff_url}\033]8;;\033\\"
-
-                        print(f"{colorama.Fore.WHITE}╭─ {colorama.Fore.CYAN}{change.get('title')}{colorama.Style.RESET_ALL}")
-                        print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}Organization: {org_color}{org}{colorama.Style.RESET_ALL}")
-                        print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}IP Address: {colorama.Fore.WHITE}{change.get('user')}{colorama.Style.RESET_ALL}")
-                        print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}Time: {colorama.Fore.WHITE}{timestamp_str}{colorama.Style.RESET_ALL}")
-                        print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}Diff URL: {colorama.Fore.BLUE}{clickable_url}{colorama.Style.RESET_ALL}")
-
-                        comment = change.get('comment', '')[:80]
-                        if comment:
-                            print(f"{colorama.Fore.WHITE}╰─ {colorama.Fore.YELLOW}Comment: {colorama.Fore.WHITE}{comment}...{colorama.Style.RESET_ALL}\n")
-                        else:
-                            print(f"{colorama.Fore.WHITE}╰{colorama.Style.RESET_ALL}\n")
-
-                    logging.info("GOVERNMENT EDIT DETECTED")
-                    for change in government_changes:
-                        _, org = ip_cache.check_ip(change.get("user"))
-                        logging.info(f"Title: {change.get('title')} | IP: {change.get('user')} | Org: {org} | Time: {convert_timestamp(change.get('timestamp'))} | Comment: {change.get('comment','')[:100]}")
+                        print_change(change, timestamp_str, create_diff_url(change.get("revid"), change.get("parentid")))
+                        logging.info("Title: %s | IP: %s | Org: %s | Time: %s | Comment: %s",
+                                     change.get('title'), change.get('user'), change["_org"],
+                                     timestamp_str, change.get('comment', '')[:100])
 
                     # Save and post changes
-                    save_and_post_changes(government_changes, ip_cache)
+                    save_and_post_changes(government_changes, ip_cache, OUTPUT_CSV, SENSITIVE_CSV)
 
                     for change in government_changes:
                         processed_changes.add(change.get("rcid"))
 
                     total_changes += len(government_changes)
-                    print(f"{colorama.Fore.GREEN}✅ Processed and posted {len(government_changes)} edit(s) | Total: {total_changes}{colorama.Style.RESET_ALL}\n")
-                else:
-                    # Show animated polling status on same line
+                    print(f"{FORE.GREEN}✅ Processed and posted {len(government_changes)} edit(s) | Total: {total_changes}{RESET}\n")
+                elif time.monotonic() - last_status_draw >= STATUS_REFRESH_INTERVAL:
+                    # Show animated polling status on same line, redrawn at most
+                    # once per STATUS_REFRESH_INTERVAL
+                    last_status_draw = time.monotonic()
+                    spinner = spinner_frames[spinner_idx % len(spinner_frames)]
+                    spinner_idx += 1
+                    current_time = clock_str()
                     if all_changes:
-                        current_time = datetime.now().strftime('%H:%M:%S')
                         batch_info = f" ({batch_count} batch{'es' if batch_count > 1 else ''})" if batch_count > 1 else ""
-                        print(f"\r{colorama.Fore.CYAN}{spinner} Polling... {colorama.Fore.WHITE}[{current_time}] {colorama.Fore.YELLOW}Checked {len(all_changes)} changes{batch_info}{colorama.Style.RESET_ALL}", end="", flush=True)
+                        sys.stdout.write(f"\r{FORE.CYAN}{spinner} Polling... {FORE.WHITE}[{current_time}] {FORE.YELLOW}Checked {len(all_changes)} changes{batch_info}{RESET}")
                     else:
                         # Show spinner even with no changes
-                        current_time = datetime.now().strftime('%H:%M:%S')
-                        print(f"\r{colorama.Fore.CYAN}{spinner} Polling... {colorama.Fore.WHITE}[{current_time}]{colorama.Style.RESET_ALL}", end="", flush=True)
+                        sys.stdout.write(f"\r{FORE.CYAN}{spinner} Polling... {FORE.WHITE}[{current_time}]{RESET}")
+                    if sys.stdout.isatty():
+                        sys.stdout.flush()
 
                 # Always update timestamp to avoid infinite loops
                 if all_changes:
-                    latest_timestamp = max(change["timestamp"] for change in all_changes)
-                    last_timestamp = latest_timestamp
+                    # rcdir=newer returns pages oldest-first, so the last change is the latest
+                    last_timestamp = all_changes[-1]["timestamp"]
+                    logging.debug("Updated timestamp to: %s", last_timestamp)
+
+                # Persist at most once per STATE_SAVE_INTERVAL; shutdown always saves
+                if last_timestamp != saved_timestamp and time.monotonic() - last_state_save >= STATE_SAVE_INTERVAL:
                     save_state(STATE_FILE, last_timestamp)
-                    logging.debug(f"Updated timestamp to: {last_timestamp}")
+                    saved_timestamp = last_timestamp
+                    last_state_save = time.monotonic()
 
             except Exception as e:
                 logging.error(f"Error during polling: {e}", exc_info=True)
 
-            time.sleep(REALTIME_POLL_INTERVAL)
+            next_poll += REALTIME_POLL_INTERVAL
+            delay = next_poll - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            else:
+                next_poll = time.monotonic()
 
     except KeyboardInterrupt:
-        print(f"\n\n{colorama.Fore.YELLOW}╔{'═'*58}╗{colorama.Style.RESET_ALL}")
-        print(f"{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL} {colorama.Fore.YELLOW}⏸️  Shutting down gracefully...{colorama.Style.RESET_ALL}{' '*26}{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL}")
-        print(f"{colorama.Fore.YELLOW}╚{'═'*58}╝{colorama.Style.RESET_ALL}")
+        print(SHUTDOWN_BOX)
         shutdown_timestamp = datetime.now(timezone.utc).isoformat()
         save_state(STATE_FILE, shutdown_timestamp)
-        print(f"\n{colorama.Fore.GREEN}✅ Final total: {total_changes} government edits detected{colorama.Style.RESET_ALL}")
-        print(f"{colorama.Fore.CYAN}╚{'═'*58}╝{colorama.Style.RESET_ALL}\n")
+        print(f"\n{FORE.GREEN}✅ Final total: {total_changes} government edits detected{RESET}")
+        print(f"{BANNER_BOTTOM}\n")
         logging.info(f"Shutting down... Recorded shutdown timestamp: {shutdown_timestamp}")
+        finish_media()
         logging.info(f"Final total of government changes logged: {total_changes}")
 
 
-def save_and_post_changes(changes, ip_cache):
-    """Save changes to CSV and optionally post to Bluesky"""
-    # Save to CSV
-    save_to_csv(changes, ip_cache, OUTPUT_CSV, SENSITIVE_CSV)
-
-    # Prepare changes for posting to Bluesky
-    formatted_changes = []
-    for change in changes:
-        _, org = ip_cache.check_ip(change.get("user"))
-        screenshot_path = take_screenshot(
-            create_diff_url(change.get("revid"), change.get("parentid")),
-            change.get("title"),
-            change.get("timestamp"),
-        )
-        formatted_changes.append({
-            "title": change.get("title"),
-            "organization": org,
-            "screenshot_path": screenshot_path,
-            "change_data": change
-        })
-
-    # Post changes to Bluesky
-    post_to_bluesky(formatted_changes)
-
-
 if __name__ == "__main__":
     run_realtime_monitor()
@@ -2,20 +2,28 @@
 Streaming Wikipedia monitoring mode using EventStreams API
 """
 import logging
-import json
-import colorama
+import queue
+import sys
+import threading
+import time
+import orjson
 from datetime import datetime, timezone, timedelta
-from dateutil import parser
 import sseclient
 import requests
 from core.ip_matcher import IPNetworkCache
-from core.scanner import filter_government_changes
-from processors.screenshot import take_screenshot, create_diff_url
-from processors.csv_handler import save_to_csv
-from processors.bluesky_poster import post_to_bluesky
-from utils.helpers import load_state, save_state, convert_timestamp, is_ip_address
+from core.scanner import filter_government_change
+from processors.screenshot import create_diff_url
+from processors.csv_handler import init_csv_files
+from processors.alerts import save_and_post_changes, finish_media
+from utils.helpers import (
+    BoundedSet, clock_str, load_state, save_state, convert_timestamp, is_ip_address, parse_timestamp,
+)
+from utils.display import (
+    FORE, RESET, RULE, BANNER_TOP, BANNER_DIVIDER, BANNER_BOTTOM, ALERT_BOX, SHUTDOWN_BOX,
+    banner_row, print_change,
+)
 from utils.logging_config import setup_logging
-from config.settings import DEFAULT_FILTER
+from config.settings import DEFAULT_FILTER, STATUS_REFRESH_INTERVAL, STATE_SAVE_INTERVAL
 
 STATE_FILE = "streaming_state.json"
 OUTPUT_CSV = "government_changes.csv"
@@ -23,6 +31,43 @@ SENSITIVE_CSV = "sensitive_content_changes.csv"
 LOG_FILE = "wikipedia_streaming.log"
 STREAM_URL = "https://stream.wikimedia.org/v2/stream/recentchange"
 USER_AGENT = "GovEditsBot/1.0 (https://github.com/yourusername/govedits; contact@example.com)"
+EVENT_QUEUE_SIZE = 256  # Events buffered between the stream reader and the processing loop
+
+# Status line templates, built once instead of per event
+_STREAMING_STATUS = f"\r{FORE.CYAN}{{spinner}} Streaming... {FORE.WHITE}[{{time}}] {FORE.YELLOW}Latest: {{title}}{RESET}"
+_CATCHUP_STATUS = (
+    f"\r{FORE.YELLOW}{{spinner}} Catching up... {FORE.WHITE}[{{time}}] "
+    f"{FORE.CYAN}{{percent}}% {FORE.YELLOW}Latest: {{title}}{RESET}"
+)
+
+
+def read_events(response: requests.Response, events: queue.Queue):
+    """
+    Read SSE events from an open stream into a bounded queue
+
+    Runs on its own thread so slow processing doesn't stall the socket. When
+    the queue is full the reader blocks, pushing back on the stream instead of
+    buffering without limit. The stream ending is signalled with None, and any
+    error is handed to the consumer to raise.
+
+    Args:
+        response: Streaming EventStreams response
+        events: Queue receiving raw event data strings
+    """
+    try:
+        for event in sseclient.SSEClient(response).events():
+            if event.data:
+                events.put(event.data)
+        end = None
+    except Exception as e:
+        end = e
+
+    # The consumer may already have stopped reading (e.g. on shutdown), so
+    # don't wait forever to deliver the final item
+    try:
+        events.put(end, timeout=60)
+    except queue.Full:
+        pass
 
 
 def format_timestamp(dt: datetime) -> str:
@@ -38,6 +83,25 @@ def format_timestamp(dt: datetime) -> str:
     return dt.strftime('%Y-%m-%dT%H:%M:%SZ')
 
 
+def event_datetime(ts_value) -> datetime:
+    """
+    Convert an EventStreams or state file timestamp to an aware UTC datetime
+
+    Args:
+        ts_value: Unix timestamp (int) or ISO format string
+
+    Returns:
+        Timezone-aware datetime (naive strings are taken as UTC)
+    """
+    if isinstance(ts_value, int):
+        return datetime.fromtimestamp(ts_value, tz=timezone.utc)
+
+    dt = parse_timestamp(str(ts_value))
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
 def check_gap_and_run_catchup(last_timestamp: str) -> bool:
     """
     Check if there's a >31 day gap and run historical catchup if needed
@@ -52,16 +116,16 @@ def check_gap_and_run_catchup(last_timestamp: str) -> bool:
         return False
 
     try:
-        last_time = parser.isoparse(last_timestamp)
+        last_time = event_datetime(last_timestamp)
         now = datetime.now(timezone.utc)
         gap = now - last_time
 
         if gap.days > 31:
             logging.warning(f"Gap of {gap.days} days detected. Running historical catchup first...")
-            print(f"\n{colorama.Fore.YELLOW}╔{'═'*58}╗{colorama.Style.RESET_ALL}")
-            print(f"{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL} {colorama.Fore.YELLOW}⚠️  Gap of {gap.days} days detected{colorama.Style.RESET_ALL}{' '*(58-len(f'Gap of {gap.days} days detected')-4)}{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL}")
-            print(f"{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}Running historical catchup first...{colorama.Style.RESET_ALL}{' '*21}{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL}")
-            print(f"{colorama.Fore.YELLOW}╚{'═'*58}╝{colorama.Style.RESET_ALL}\n")
+            print(f"\n{FORE.YELLOW}╔{RULE}╗{RESET}")
+            print(f"{FORE.YELLOW}║{RESET} {FORE.YELLOW}⚠️  Gap of {gap.days} days detected{RESET}{' '*(58-len(f'Gap of {gap.days} days detected')-4)}{FORE.YELLOW}║{RESET}")
+            print(f"{FORE.YELLOW}║{RESET} {FORE.WHITE}Running historical catchup first...{RESET}{' '*21}{FORE.YELLOW}║{RESET}")
+            print(f"{FORE.YELLOW}╚{RULE}╝{RESET}\n")
 
             # Import and run historical catchup
             from modes.historical import run_historical_scan
@@ -84,8 +148,9 @@ def run_streaming_monitor(filter_level: str = DEFAULT_FILTER):
     setup_logging(LOG_FILE)
 
     total_changes = 0
-    processed_changes = set()
+    processed_changes = BoundedSet(maxlen=10_000)  # Only government edits are added, and rcids only grow
     ip_cache = IPNetworkCache(filter_level=filter_level)
+    init_csv_files(OUTPUT_CSV, SENSITIVE_CSV)
 
     logging.info(f"Loaded {len(ip_cache.networks['v4'])} IPv4 ranges and {len(ip_cache.networks['v6'])} IPv6 ranges")
 
@@ -99,26 +164,17 @@ def run_streaming_monitor(filter_level: str = DEFAULT_FILTER):
     # Spinner animation frames
     spinner_frames = ['⠋', '⠙', '⠹', '⠸', '⠼', '⠴', '⠦', '⠧', '⠇', '⠏']
     spinner_idx = 0
+    last_status_draw = 0.0
 
     # Enhanced terminal display with box drawing
     # Note: emoji 📡 takes 2 character widths, so adjust spacing accordingly
-    print(f"\n{colorama.Fore.CYAN}╔{'═'*58}╗{colorama.Style.RESET_ALL}")
-    print(f"{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL} 📡 Wikipedia Government Edit Monitor (Streaming){' '*8}{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL}")
-    print(f"{colorama.Fore.CYAN}╠{'═'*58}╣{colorama.Style.RESET_ALL}")
-
-    filter_text = f"Filter: {filter_level}"
-    filter_padding = 58 - len(filter_text) - 1
-    print(f"{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}{filter_text}{colorama.Style.RESET_ALL}{' '*filter_padding}{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL}")
-
-    ranges_text = f"Ranges: {len(ip_cache.networks['v4'])} IPv4 + {len(ip_cache.networks['v6'])} IPv6"
-    ranges_padding = 58 - len(ranges_text) - 1
-    print(f"{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}{ranges_text}{colorama.Style.RESET_ALL}{' '*ranges_padding}{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL}")
-
-    stream_text = "Mode: EventStreams (Real-time)"
-    stream_padding = 58 - len(stream_text) - 1
-    print(f"{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}{stream_text}{colorama.Style.RESET_ALL}{' '*stream_padding}{colorama.Fore.CYAN}║{colorama.Style.RESET_ALL}")
-
-    print(f"{colorama.Fore.CYAN}╚{'═'*58}╝{colorama.Style.RESET_ALL}\n")
+    print(BANNER_TOP)
+    print(f"{FORE.CYAN}║{RESET} 📡 Wikipedia Government Edit Monitor (Streaming){' '*8}{FORE.CYAN}║{RESET}")
+    print(BANNER_DIVIDER)
+    print(banner_row(f"Filter: {filter_level}"))
+    print(banner_row(f"Ranges: {len(ip_cache.networks['v4'])} IPv4 + {len(ip_cache.networks['v6'])} IPv6"))
+    print(banner_row("Mode: EventStreams (Real-time)"))
+    print(f"{BANNER_BOTTOM}\n")
 
     logging.info("Connecting to EventStreams API...")
 
@@ -129,7 +185,7 @@ def run_streaming_monitor(filter_level: str = DEFAULT_FILTER):
 
     if last_timestamp:
         try:
-            last_dt = parser.isoparse(last_timestamp)
+            last_dt = event_datetime(last_timestamp)
             now_dt = datetime.now(timezone.utc)
             gap = now_dt - last_dt
             gap_seconds = gap.total_seconds()
@@ -149,13 +205,17 @@ def run_streaming_monitor(filter_level: str = DEFAULT_FILTER):
                     minutes = int(gap_seconds // 60)
                     gap_str = f"{minutes} minute{'s' if minutes != 1 else ''}"
 
-                print(f"{colorama.Fore.YELLOW}⏳ Catching up from: {colorama.Fore.CYAN}{last_timestamp}{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}({gap_str} ago){colorama.Style.RESET_ALL}")
+                print(f"{FORE.YELLOW}⏳ Catching up from: {FORE.CYAN}{last_timestamp}{RESET} {FORE.WHITE}({gap_str} ago){RESET}")
             else:
-                print(f"{colorama.Fore.GREEN}▶️  Resuming from: {colorama.Fore.CYAN}{last_timestamp}{colorama.Style.RESET_ALL} {colorama.Fore.WHITE}(live){colorama.Style.RESET_ALL}")
+                print(f"{FORE.GREEN}▶️  Resuming from: {FORE.CYAN}{last_timestamp}{RESET} {FORE.WHITE}(live){RESET}")
         except Exception as e:
             logging.error(f"Error parsing timestamp: {e}")
 
+    saved_timestamp = last_timestamp
+    last_state_save = 0.0
+
     # Auto-reconnect loop
+    response = None
     while True:
         try:
             # Connect to EventStreams
@@ -163,114 +223,101 @@ def run_streaming_monitor(filter_level: str = DEFAULT_FILTER):
             response = requests.get(STREAM_URL, stream=True, headers=headers, timeout=None)
             response.raise_for_status()
 
-            client = sseclient.SSEClient(response)
+            events = queue.Queue(maxsize=EVENT_QUEUE_SIZE)
+            threading.Thread(target=read_events, args=(response, events), daemon=True).start()
 
             logging.info("Connected to EventStreams - monitoring for government edits...")
-            print(f"{colorama.Fore.GREEN}✅ Connected to EventStreams{colorama.Style.RESET_ALL}\n")
+            print(f"{FORE.GREEN}✅ Connected to EventStreams{RESET}\n")
+
+            while True:
+                event_data = events.get()
+                if event_data is None:
+                    # Server closed the stream; reconnect
+                    raise requests.exceptions.ConnectionError("EventStreams closed the connection")
+                if isinstance(event_data, Exception):
+                    raise event_data
+
+                # Cheap substring checks on the raw text drop most of the
+                # firehose (other wikis, bots) before paying for a JSON parse.
+                # Both only ever let extra events through; the parsed fields
+                # below are still checked.
+                if '"enwiki"' not in event_data or '"bot":true' in event_data:
+                    continue
 
-            for event in client.events():
                 try:
                     # Parse event data
-                    if event.data:
-                        data = json.loads(event.data)
+                    data = orjson.loads(event_data)
 
                     # Filter for English Wikipedia edits only
                     if data.get('wiki') != 'enwiki':
                         continue
 
-                    # Skip bot edits
-                    if data.get('bot', False):
-                        continue
-
-                    # Only process edits from IP addresses (anonymous users)
+                    # Only process edits from IP addresses (anonymous users).
+                    # This rejects almost every remaining event, so it runs
+                    # before any other field is read.
                     user = data.get('user', '')
                     if not is_ip_address(user):
                         continue
 
+                    # Skip bot edits
+                    if data.get('bot', False):
+                        continue
+
                     # Convert EventStreams format to our expected format
+                    revision = data.get('revision')
+                    if not isinstance(revision, dict):
+                        revision = None
+                    event_id = data.get('id')
                     change = {
                         'title': data.get('title', ''),
                         'user': user,
                         'timestamp': data.get('timestamp'),
                         'comment': data.get('comment', ''),
-                        'revid': data.get('revision', {}).get('new') if isinstance(data.get('revision'), dict) else data.get('id'),
-                        'parentid': data.get('revision', {}).get('old') if isinstance(data.get('revision'), dict) else None,
-                        'rcid': data.get('id'),
+                        'revid': revision.get('new') if revision is not None else event_id,
+                        'parentid': revision.get('old') if revision is not None else None,
+                        'rcid': event_id,
                         'type': data.get('type'),
                     }
 
-                    # Update spinner for visual feedback
-                    spinner = spinner_frames[spinner_idx % len(spinner_frames)]
-                    spinner_idx += 1
-
                     # Check if this is a government edit
-                    government_changes = filter_government_changes([change], ip_cache, processed_changes)
+                    hit = filter_government_change(change, ip_cache, processed_changes)
+                    government_changes = (hit,) if hit else ()
 
                     if government_changes:
                         # Clear the polling line and show alerts
                         print(f"\r{' '*80}\r", end="")  # Clear line
-                        print(f"\n{colorama.Fore.RED}╔{'═'*58}╗{colorama.Style.RESET_ALL}")
-                        print(f"{colorama.Fore.RED}║{colorama.Style.RESET_ALL} {colorama.Fore.RED}🚨 GOVERNMENT EDIT DETECTED{colorama.Style.RESET_ALL}{' '*26}{colorama.Fore.RED}║{colorama.Style.RESET_ALL}")
-                        print(f"{colorama.Fore.RED}╚{'═'*58}╝{colorama.Style.RESET_ALL}\n")
+                        print(ALERT_BOX)
 
                         for change in government_changes:
-                            _, org = ip_cache.check_ip(change.get("user"))
                             timestamp_str = convert_timestamp(change.get('timestamp'))
-
-                            # Determine org color based on type
-                            org_lower = org.lower()
-                            if any(x in org_lower for x in ['senate', 'house of representatives', 'congress']):
-                                org_color = colorama.Fore.MAGENTA
-                            elif any(x in org_lower for x in ['department', 'white house', 'executive']):
-                                org_color = colorama.Fore.BLUE
-                            elif 'court' in org_lower:
-                                org_color = colorama.Fore.CYAN
-                            else:
-                                org_color = colorama.Fore.YELLOW
-
-                            # Create clickable link (works in modern terminals)
-                            diff_url = create_diff_url(change.get("revid"), change.get("parentid"))
-                            clickable_url = f"\033]8;;{diff_url}\033\\{diff_url}\033]8;;\033\\"
-
-                            print(f"{colorama.Fore.WHITE}╭─ {colorama.Fore.CYAN}{change.get('title')}{colorama.Style.RESET_ALL}")
-                            print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}Organization: {org_color}{org}{colorama.Style.RESET_ALL}")
-                            print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}IP Address: {colorama.Fore.WHITE}{change.get('user')}{colorama.Style.RESET_ALL}")
-                            print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}Time: {colorama.Fore.WHITE}{timestamp_str}{colorama.Style.RESET_ALL}")
-                            print(f"{colorama.Fore.WHITE}├─ {colorama.Fore.YELLOW}Diff URL: {colorama.Fore.BLUE}{clickable_url}{colorama.Style.RESET_ALL}")
-
-                            comment = change.get('comment', '')[:80]
-                            if comment:
-                                print(f"{colorama.Fore.WHITE}╰─ {colorama.Fore.YELLOW}Comment: {colorama.Fore.WHITE}{comment}...{colorama.Style.RESET_ALL}\n")
-                            else:
-                                print(f"{colorama.Fore.WHITE}╰{colorama.Style.RESET_ALL}\n")
+                            print_change(change, timestamp_str, create_diff_url(change.get("revid"), change.get("parentid")))
 
                         logging.info("GOVERNMENT EDIT DETECTED")
                         for change in government_changes:
-                            _, org = ip_cache.check_ip(change.get("user"))
+                            org = change["_org"]
                             logging.info(f"Title: {change.get('title')} | IP: {change.get('user')} | Org: {org} | Time: {convert_timestamp(change.get('timestamp'))} | Comment: {change.get('comment','')[:100]}")
 
                         # Save and post changes
-                        save_and_post_changes(government_changes, ip_cache)
+                        save_and_post_changes(government_changes, ip_cache, OUTPUT_CSV, SENSITIVE_CSV)
 
                         for change in government_changes:
                             processed_changes.add(change.get("rcid"))
 
                         total_changes += len(government_changes)
-                        print(f"{colorama.Fore.GREEN}✅ Processed and posted {len(government_changes)} edit(s) | Total: {total_changes}{colorama.Style.RESET_ALL}\n")
-                    else:
-                        # Show animated streaming status on same line
-                        current_time = datetime.now().strftime('%H:%M:%S')
+                        print(f"{FORE.GREEN}✅ Processed and posted {len(government_changes)} edit(s) | Total: {total_changes}{RESET}\n")
+                    elif time.monotonic() - last_status_draw >= STATUS_REFRESH_INTERVAL:
+                        # Show animated streaming status on same line, redrawn at
+                        # most once per STATUS_REFRESH_INTERVAL
+                        last_status_draw = time.monotonic()
+
+                        # Advance the spinner only when the line is drawn
+                        spinner = spinner_frames[spinner_idx % len(spinner_frames)]
+                        spinner_idx += 1
 
                         # Check if we're in catchup mode
                         if is_catching_up and change.get('timestamp'):
                             # Get event timestamp
-                            ts_value = change['timestamp']
-                            if isinstance(ts_value, int):
-                                event_dt = datetime.fromtimestamp(ts_value, tz=timezone.utc)
-                            else:
-                                event_dt = parser.isoparse(str(ts_value))
-                                if event_dt.tzinfo is None:
-                                    event_dt = event_dt.replace(tzinfo=timezone.utc)
+                            event_dt = event_datetime(change['timestamp'])
 
                             # Calculate progress
                             total_gap = (catchup_end_time - catchup_start_time).total_seconds()
@@ -284,30 +331,36 @@ def run_streaming_monitor(filter_level: str = DEFAULT_FILTER):
                             if lag < 30:
                                 # We've caught up!
                                 print(f"\r{' '*80}\r", end="")
-                                print(f"{colorama.Fore.GREEN}✅ Caught up! Now streaming live...{colorama.Style.RESET_ALL}")
+                                print(f"{FORE.GREEN}✅ Caught up! Now streaming live...{RESET}")
                                 is_catching_up = False
                             else:
                                 # Still catching up - show progress
-                                event_time_str = event_dt.strftime('%H:%M:%S')
-                                print(f"\r{colorama.Fore.YELLOW}{spinner} Catching up... {colorama.Fore.WHITE}[{event_time_str}] {colorama.Fore.CYAN}{percent}% {colorama.Fore.YELLOW}Latest: {change.get('title', 'N/A')[:20]}{colorama.Style.RESET_ALL}", end="", flush=True)
+                                sys.stdout.write(_CATCHUP_STATUS.format(
+                                    spinner=spinner, time=event_dt.strftime('%H:%M:%S'),
+                                    percent=percent, title=change.get('title', 'N/A')[:20],
+                                ))
                         else:
                             # Normal streaming mode
-                            print(f"\r{colorama.Fore.CYAN}{spinner} Streaming... {colorama.Fore.WHITE}[{current_time}] {colorama.Fore.YELLOW}Latest: {change.get('title', 'N/A')[:30]}{colorama.Style.RESET_ALL}", end="", flush=True)
+                            sys.stdout.write(_STREAMING_STATUS.format(
+                                spinner=spinner, time=clock_str(), title=change.get('title', 'N/A')[:30],
+                            ))
+
+                        if sys.stdout.isatty():
+                            sys.stdout.flush()
 
                     # Update timestamp - format as YYYY-MM-DDTHH:MM:SSZ
                     if change.get('timestamp'):
                         # EventStreams may provide timestamp as int (Unix timestamp) or string (ISO format)
-                        ts_value = change['timestamp']
-                        if isinstance(ts_value, int):
-                            ts = datetime.fromtimestamp(ts_value, tz=timezone.utc)
-                        else:
-                            ts = parser.isoparse(str(ts_value))
-                            if ts.tzinfo is None:
-                                ts = ts.replace(tzinfo=timezone.utc)
-                        last_timestamp = format_timestamp(ts)
+                        last_timestamp = format_timestamp(event_datetime(change['timestamp']))
+
+                    # Persist at most once per STATE_SAVE_INTERVAL; reconnects
+                    # and shutdown always save
+                    if last_timestamp != saved_timestamp and time.monotonic() - last_state_save >= STATE_SAVE_INTERVAL:
                         save_state(STATE_FILE, last_timestamp)
+                        saved_timestamp = last_timestamp
+                        last_state_save = time.monotonic()
 
-                except json.JSONDecodeError as e:
+                except orjson.JSONDecodeError as e:
                     logging.debug(f"Failed to parse event data: {e}")
                     continue
                 except Exception as e:
@@ -318,49 +371,30 @@ def run_streaming_monitor(filter_level: str = DEFAULT_FILTER):
                 requests.exceptions.Timeout,
                 requests.exceptions.ChunkedEncodingError) as e:
             # Connection dropped - reconnect automatically
+            if response is not None:
+                response.close()
+            if last_timestamp != saved_timestamp:
+                save_state(STATE_FILE, last_timestamp)
+                saved_timestamp = last_timestamp
             logging.warning(f"Connection lost: {e}. Reconnecting in 5 seconds...")
-            print(f"\n{colorama.Fore.YELLOW}⚠️  Connection lost. Reconnecting in 5 seconds...{colorama.Style.RESET_ALL}")
-            import time
+            print(f"\n{FORE.YELLOW}⚠️  Connection lost. Reconnecting in 5 seconds...{RESET}")
             time.sleep(5)
             continue  # Retry the while True loop
 
         except KeyboardInterrupt:
-            print(f"\n\n{colorama.Fore.YELLOW}╔{'═'*58}╗{colorama.Style.RESET_ALL}")
-            print(f"{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL} {colorama.Fore.YELLOW}⏸️  Shutting down gracefully...{colorama.Style.RESET_ALL}{' '*26}{colorama.Fore.YELLOW}║{colorama.Style.RESET_ALL}")
-            print(f"{colorama.Fore.YELLOW}╚{'═'*58}╝{colorama.Style.RESET_ALL}")
+            # Unblocks the reader thread if it is waiting on the socket
+            if response is not None:
+                response.close()
+            print(SHUTDOWN_BOX)
             shutdown_timestamp = format_timestamp(datetime.now(timezone.utc))
             save_state(STATE_FILE, shutdown_timestamp)
-            print(f"\n{colorama.Fore.GREEN}✅ Final total: {total_changes} government edits detected{colorama.Style.RESET_ALL}")
-            print(f"{colorama.Fore.CYAN}╚{'═'*58}╝{colorama.Style.RESET_ALL}\n")
+            print(f"\n{FORE.GREEN}✅ Final total: {total_changes} government edits detected{RESET}")
+            print(f"{BANNER_BOTTOM}\n")
             logging.info(f"Shutting down... Recorded shutdown timestamp: {shutdown_timestamp}")
+            finish_media()
             logging.info(f"Final total of government changes logged: {total_changes}")
             break  # Exit the while loop
 
 
-def save_and_post_changes(changes, ip_cache):
-    """Save changes to CSV and optionally post to Bluesky"""
-    # Save to CSV
-    save_to_csv(changes, ip_cache, OUTPUT_CSV, SENSITIVE_CSV)
-
-    # Prepare changes for posting to Bluesky
-    formatted_changes = []
-    for change in changes:
-        _, org = ip_cache.check_ip(change.get("user"))
-        screenshot_path = take_screenshot(
-            create_diff_url(change.get("revid"), change.get("parentid")),
-            change.get("title"),
-            change.get("timestamp"),
-        )
-        formatted_changes.append({
-            "title": change.get("title"),
-            "organization": org,
-            "screenshot_path": screenshot_path,
-            "change_data": change
-        })
-
-    # Post changes to Bluesky
-    post_to_bluesky(formatted_changes)
-
-
 if __name__ == "__main__":
     run_streaming_monitor()
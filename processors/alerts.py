@@ -0,0 +1,66 @@
+"""
+Background screenshot and Bluesky handling for government edits found by the monitoring modes
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+from processors.screenshot import take_screenshots, create_diff_url
+from processors.csv_handler import save_to_csv
+from processors.bluesky_poster import post_to_bluesky
+
+# Screenshots and Bluesky posts run off the monitoring loop; the semaphore caps
+# how many batches may be waiting so a backlog slows the monitor instead of growing
+MEDIA_EXECUTOR = ThreadPoolExecutor(max_workers=2)
+MEDIA_SLOTS = threading.BoundedSemaphore(256)
+
+
+def save_and_post_changes(changes: List[Dict], ip_cache, output_csv: str, sensitive_csv: str):
+    """
+    Save changes to CSV, then screenshot and post them in the background
+
+    Args:
+        changes: Annotated government change dictionaries
+        ip_cache: IPNetworkCache instance for organization lookup
+        output_csv: Path to main output CSV file
+        sensitive_csv: Path to sensitive content CSV file
+    """
+    save_to_csv(changes, ip_cache, output_csv, sensitive_csv)
+
+    MEDIA_SLOTS.acquire()
+    future = MEDIA_EXECUTOR.submit(screenshot_and_post, changes)
+    future.add_done_callback(_media_done)
+
+
+def _media_done(future):
+    """Release the batch's slot and surface any error from the worker"""
+    MEDIA_SLOTS.release()
+    if future.exception():
+        logging.error(f"Screenshot/post batch failed: {future.exception()}")
+
+
+def screenshot_and_post(changes: List[Dict]):
+    """Take screenshots for changes and post them to Bluesky"""
+    # Capture the batch concurrently on the shared browser
+    screenshot_paths = take_screenshots([
+        (create_diff_url(change.get("revid"), change.get("parentid")), change.get("title"), change.get("timestamp"))
+        for change in changes
+    ])
+
+    # Prepare changes for posting to Bluesky
+    formatted_changes = []
+    for change, screenshot_path in zip(changes, screenshot_paths):
+        formatted_changes.append({
+            "title": change.get("title"),
+            "organization": change["_org"],
+            "screenshot_path": screenshot_path,
+            "change_data": change
+        })
+
+    # Post changes to Bluesky
+    post_to_bluesky(formatted_changes)
+
+
+def finish_media():
+    """Wait for queued screenshot/post batches to complete (call once, at shutdown)"""
+    MEDIA_EXECUTOR.shutdown(wait=True)
@@ -4,14 +4,20 @@ Bluesky social media posting functionality
 import json
 import logging
 import os
+import random
+import threading
 import time
-from typing import Dict, List
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+from zoneinfo import ZoneInfo
 import piexif
-import pytz
-from dateutil import parser
 from atproto import Client, models
 from processors.screenshot import create_diff_url
-from config.settings import CONFIG_FILE, ENABLE_BLUESKY_POSTING, BLUESKY_DELAY
+from utils.helpers import parse_timestamp
+from config.settings import (
+    CONFIG_FILE, ENABLE_BLUESKY_POSTING, BLUESKY_DELAY, BLUESKY_BATCH_SIZE, BLUESKY_UPLOAD_WORKERS,
+    BLUESKY_MAX_RETRIES,
+)
 
 
 def load_bluesky_credentials(config_file: str = CONFIG_FILE) -> Dict:
@@ -24,9 +30,94 @@ def load_bluesky_credentials(config_file: str = CONFIG_FILE) -> Dict:
         return None
 
 
+# Logged-in clients by credentials file, so repeated posting reuses the
+# session and its keep-alive connection instead of logging in every time
+_clients: Dict[str, Client] = {}
+_clients_lock = threading.Lock()
+
+
+def get_client(bluesky_credentials_file: str = CONFIG_FILE) -> Client:
+    """
+    Return a logged-in Bluesky client, creating it on first use
+
+    Args:
+        bluesky_credentials_file: Path to credentials JSON
+
+    Returns:
+        Logged-in Client, or None if credentials are missing or login fails
+    """
+    # Held through login so concurrent media workers don't each log in
+    with _clients_lock:
+        client = _clients.get(bluesky_credentials_file)
+        if client is not None:
+            return client
+
+        bluesky_credentials = load_bluesky_credentials(bluesky_credentials_file)
+        if not bluesky_credentials:
+            logging.error("Bluesky credentials are missing. Skipping posting.")
+            return None
+
+        try:
+            client = Client()
+            client.login(bluesky_credentials['email'], bluesky_credentials['password'])
+        except Exception as e:
+            logging.error(f"Failed to log in to Bluesky: {e}")
+            return None
+
+        _clients[bluesky_credentials_file] = client
+        return client
+
+
+# Only these formats can carry EXIF; our Playwright screenshots are PNGs without it
+EXIF_EXTENSIONS = ('.jpg', '.jpeg', '.tif', '.tiff')
+EXIF_SCAN_BYTES = 65536
+MAX_IMAGE_BYTES = 1000000
+
+
+def has_exif_segment(head: bytes) -> bool:
+    """
+    Check whether a JPEG header may contain an APP1 (EXIF) segment
+
+    Walks the marker segments from the start of the file up to the start of
+    scan data, so an 0xFFE1 byte pair inside other segments isn't mistaken
+    for EXIF. Only a walk that reaches the image data without seeing APP1
+    rules EXIF out; a header that is truncated (e.g. by large ICC segments)
+    or can't be parsed is treated as possibly carrying it.
+
+    Args:
+        head: Leading bytes of the image file
+
+    Returns:
+        False only if the header provably has no APP1 segment
+    """
+    if not head.startswith(b'\xff\xd8'):
+        return True
+
+    pos = 2
+    while pos + 1 < len(head):
+        if head[pos] != 0xFF:
+            return True
+        marker = head[pos + 1]
+        if marker == 0xFF:  # Fill byte before a marker
+            pos += 1
+            continue
+        if marker == 0xE1:
+            return True
+        if marker in (0xDA, 0xD9):  # Start of scan or end of image, no more metadata segments
+            return False
+        if pos + 4 > len(head):
+            break
+        pos += 2 + int.from_bytes(head[pos + 2:pos + 4], 'big')
+    return True
+
+
 def strip_exif(image_path: str):
     """Remove EXIF data from image"""
     try:
+        # piexif rewrites the whole file, so only call it when there is EXIF to remove
+        with open(image_path, "rb") as f:
+            if not has_exif_segment(f.read(EXIF_SCAN_BYTES)):
+                return
         piexif.remove(image_path)
     except Exception:
         pass  # Not all images have EXIF data
@@ -34,19 +125,22 @@ def strip_exif(image_path: str):
 
 def upload_image(client: Client, image_path: str) -> dict:
     """Upload an image and return the blob"""
-    if not os.path.exists(image_path):
+    # Strip EXIF data (piexif rewrites the whole file, so skip formats without it)
+    if image_path.lower().endswith(EXIF_EXTENSIONS):
+        strip_exif(image_path)
+
+    try:
+        size = os.path.getsize(image_path)
+    except OSError:
         raise Exception(f"Image file not found: {image_path}")
 
-    # Strip EXIF data
-    strip_exif(image_path)
+    # Check file size before reading it into memory
+    if size > MAX_IMAGE_BYTES:
+        raise Exception(f"Image too large: {size} bytes. Maximum is 1,000,000 bytes")
 
     with open(image_path, "rb") as f:
         img_bytes = f.read()
 
-    # Check file size
-    if len(img_bytes) > 1000000:
-        raise Exception(f"Image too large: {len(img_bytes)} bytes. Maximum is 1,000,000 bytes")
-
     # Upload the image
     response = client.com.atproto.repo.upload_blob(img_bytes)
     return response.blob
@@ -54,16 +148,18 @@ def upload_image(client: Client, image_path: str) -> dict:
 
 def create_facets_for_url(text: str, url: str) -> List[Dict]:
     """Create facets for a URL in text on Bluesky"""
-    # Convert text to bytes to get correct byte positions
-    text_bytes = text.encode('utf-8')
-    url_bytes = url.encode('utf-8')
-
-    # Find the byte position of the URL in the text
-    start_pos = text_bytes.find(url_bytes)
-    if start_pos == -1:
+    pos = text.find(url)
+    if pos == -1:
         return []
 
-    end_pos = start_pos + len(url_bytes)
+    # Facet indices are UTF-8 byte offsets; for ASCII text they equal
+    # character offsets, so only encode the prefix when it isn't
+    if text.isascii():
+        start_pos = pos
+    else:
+        start_pos = len(text[:pos].encode('utf-8'))
+
+    end_pos = start_pos + len(url.encode('utf-8'))
 
     return [{
         "index": {
@@ -77,35 +173,102 @@ def create_facets_for_url(text: str, url: str) -> List[Dict]:
     }]
 
 
-def post_to_bluesky(changes: List[Dict], bluesky_credentials_file: str = CONFIG_FILE, delay: int = BLUESKY_DELAY):
+# Post times are shown in US Eastern Time
+EASTERN = ZoneInfo('America/New_York')
+
+# Monotonic time of the last applyWrites call, so the delay spans calls
+# (and threads: realtime and streaming post from two media workers)
+_last_write = float("-inf")
+_write_lock = threading.Lock()
+
+
+def rate_limit_wait(error: Exception, attempt: int) -> float:
+    """
+    Work out how long to back off after a failed Bluesky request
+
+    Args:
+        error: Exception raised by the atproto client
+        attempt: Zero-based retry attempt
+
+    Returns:
+        Seconds to wait before retrying, or -1 if the error isn't a rate limit
+    """
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) != 429:
+        return -1
+
+    # Prefer the server's reset time; otherwise back off exponentially
+    headers = getattr(response, "headers", None) or {}
+    reset = headers.get("ratelimit-reset") or headers.get("RateLimit-Reset")
+    if reset:
+        wait = float(reset) - time.time()
+    else:
+        wait = BLUESKY_DELAY * (2 ** attempt)
+    return max(wait, 1.0) + random.uniform(0, 1.0)
+
+
+def _call_with_retry(call) -> Optional[Exception]:
+    """Run a Bluesky write, retrying rate-limit errors; returns the final error, or None on success"""
+    for attempt in range(BLUESKY_MAX_RETRIES + 1):
+        try:
+            call()
+            return None
+        except Exception as e:
+            wait = rate_limit_wait(e, attempt)
+            if wait < 0 or attempt == BLUESKY_MAX_RETRIES:
+                return e
+            logging.warning(f"Bluesky rate limit hit, retrying in {wait:.1f}s")
+            time.sleep(wait)
+
+
+def _upload_screenshot(client: Client, title: str, screenshot_path: str):
+    """Upload a post's screenshot and return its image embed, or None to post text-only"""
+    if not (screenshot_path and os.path.exists(screenshot_path)):
+        logging.warning(f"Screenshot missing for {title}. Posting text-only.")
+        return None
+    try:
+        blob = upload_image(client, screenshot_path)
+        return {
+            "$type": "app.bsky.embed.images",
+            "images": [{"alt": f"Screenshot of edit for {title}", "image": blob}]
+        }
+    except Exception as e:
+        logging.warning(f"Failed to upload image for Bluesky post: {e}")
+        return None
+
+
+def post_to_bluesky(changes: List[Dict], bluesky_credentials_file: str = CONFIG_FILE, delay: int = BLUESKY_DELAY,
+                    client: Client = None):
     """
     Post changes to Bluesky if ENABLE_BLUESKY_POSTING is True
 
     Args:
         changes: List of change dictionaries with keys: title, organization, screenshot_path, change_data
         bluesky_credentials_file: Path to credentials JSON
-        delay: Delay between posts in seconds
+        delay: Delay between batched post requests in seconds
+        client: Optional logged-in client (defaults to the shared one from get_client)
     """
+    global _last_write
+
     if not ENABLE_BLUESKY_POSTING:
         logging.info("Bluesky posting is disabled. No posts will be made.")
         return
 
-    # Load Bluesky credentials
-    bluesky_credentials = load_bluesky_credentials(bluesky_credentials_file)
-    if not bluesky_credentials:
-        logging.error("Bluesky credentials are missing. Skipping posting.")
-        return
+    if client is None:
+        client = get_client(bluesky_credentials_file)
+        if client is None:
+            return
 
-    # Initialize Bluesky client
-    try:
-        client = Client()
-        client.login(bluesky_credentials['email'], bluesky_credentials['password'])
-    except Exception as e:
-        logging.error(f"Failed to log in to Bluesky: {e}")
-        return
+    # Upload screenshots concurrently; the records are assembled in order afterwards
+    with ThreadPoolExecutor(max_workers=BLUESKY_UPLOAD_WORKERS) as executor:
+        embeds = list(executor.map(
+            lambda change: _upload_screenshot(client, change.get("title"), change.get("screenshot_path")),
+            changes
+        ))
 
-    # Post each change to Bluesky
-    for change in changes:
+    # Build one post record per change
+    records = []
+    for change, embed in zip(changes, embeds):
         try:
             title = change.get("title")
             org = change.get("organization", "Unknown Organization")
@@ -113,14 +276,13 @@ def post_to_bluesky(changes: List[Dict], bluesky_credentials_file: str = CONFIG_
                 change.get("change_data", {}).get("revid"),
                 change.get("change_data", {}).get("parentid")
             )
-            screenshot_path = change.get("screenshot_path")
 
             # Format timestamp for display (convert to US Eastern Time)
-            timestamp = change.get("change_data", {}).get("timestamp")
+            change_data = change.get("change_data", {})
+            timestamp = change_data.get("timestamp")
             if timestamp:
-                utc_time = parser.isoparse(timestamp)
-                eastern = pytz.timezone('America/New_York')
-                local_time = utc_time.astimezone(eastern)
+                utc_time = change_data["_ts"] if "_ts" in change_data else parse_timestamp(timestamp)
+                local_time = utc_time.astimezone(EASTERN)
                 edit_date = local_time.strftime('%b %d, %Y at %-I:%M %p %Z')
                 text = f"{title} Wikipedia article edited anonymously from {org} on {edit_date}.\n\n{diff_url}"
             else:
@@ -128,25 +290,53 @@ def post_to_bluesky(changes: List[Dict], bluesky_credentials_file: str = CONFIG_
 
             facets = create_facets_for_url(text, diff_url)
 
-            if screenshot_path and os.path.exists(screenshot_path):
-                try:
-                    blob = upload_image(client, screenshot_path)
-                    embed = {
-                        "$type": "app.bsky.embed.images",
-                        "images": [{"alt": f"Screenshot of edit for {title}", "image": blob}]
-                    }
-                    client.send_post(text=text, facets=facets, embed=embed)
-                    logging.info(f"Posted to Bluesky with image: {text}")
-                except Exception as e:
-                    logging.warning(f"Failed to upload image for Bluesky post: {e}")
-                    client.send_post(text=text, facets=facets)
-                    logging.info(f"Posted to Bluesky without image: {text}")
-            else:
-                logging.warning(f"Screenshot missing for {title}. Posting text-only.")
-                client.send_post(text=text, facets=facets)
-
-            # Respect delay to avoid rate limiting
-            time.sleep(delay)
+            record = models.AppBskyFeedPost.Record(
+                text=text,
+                facets=facets,
+                embed=embed,
+                created_at=client.get_current_time_iso()
+            )
+            records.append((text, record))
 
         except Exception as e:
-            logging.error(f"Error posting to Bluesky: {e}")
+            logging.error(f"Error preparing Bluesky post: {e}")
+
+    # Create up to BLUESKY_BATCH_SIZE posts per applyWrites call
+    for i in range(0, len(records), BLUESKY_BATCH_SIZE):
+        # Respect delay to avoid rate limiting, counting time already spent since the last write
+        with _write_lock:
+            wait = _last_write + delay - time.monotonic()
+            if wait > 0:
+                time.sleep(wait)
+            _last_write = time.monotonic()
+
+        batch = records[i:i + BLUESKY_BATCH_SIZE]
+        data = models.ComAtprotoRepoApplyWrites.Data(
+            repo=client.me.did,
+            writes=[
+                models.ComAtprotoRepoApplyWrites.Create(collection="app.bsky.feed.post", value=record)
+                for _, record in batch
+            ]
+        )
+        error = _call_with_retry(lambda: client.com.atproto.repo.apply_writes(data))
+        if error is None:
+            for text, _ in batch:
+                logging.info(f"Posted to Bluesky: {text}")
+            continue
+
+        if len(batch) == 1 or rate_limit_wait(error, 0) >= 0:
+            logging.error(f"Error posting to Bluesky: {error}")
+            continue
+
+        # One bad record fails the whole applyWrites call; post the rest one at a time
+        logging.warning(f"Batch post failed ({error}), posting {len(batch)} records individually")
+        for text, record in batch:
+            error = _call_with_retry(lambda: client.com.atproto.repo.create_record(
+                models.ComAtprotoRepoCreateRecord.Data(
+                    repo=client.me.did, collection="app.bsky.feed.post", record=record
+                )
+            ))
+            if error is None:
+                logging.info(f"Posted to Bluesky: {text}")
+            else:
+                logging.error(f"Error posting to Bluesky: {error}")
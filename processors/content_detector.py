@@ -6,6 +6,42 @@ import logging
 from typing import List, Set, Tuple
 from config.settings import PHONE_PATTERNS, ADDRESS_PATTERNS
 
+# Patterns are compiled once at import; each is scanned separately so
+# overlapping matches from different patterns are all reported
+PHONE_RES = [re.compile(pattern) for pattern in PHONE_PATTERNS]
+ADDRESS_RES = [re.compile(pattern) for pattern in ADDRESS_PATTERNS]
+NON_DIGITS_RE = re.compile(r'\D')
+DIGIT_RE = re.compile(r'\d')
+
+
+def is_plausible_phone_number(text: str, start: int, end: int) -> bool:
+    """
+    Reject phone-pattern matches that can't be real North American numbers
+
+    Args:
+        text: Text the match was found in
+        start: Start offset of the match
+        end: End offset of the match
+
+    Returns:
+        False for digit runs longer than a phone number, area or exchange
+        codes starting with 0/1, and the reserved 555-01XX fictional range
+    """
+    # Part of a longer digit run (IDs, ISBNs, part numbers)
+    if (start > 0 and text[start - 1].isdigit()) or (end < len(text) and text[end].isdigit()):
+        return False
+
+    digits = NON_DIGITS_RE.sub('', text[start:end])
+    if len(digits) != 10:
+        return True
+
+    # NANP area and central office codes never start with 0 or 1
+    if digits[0] in '01' or digits[3] in '01':
+        return False
+
+    # 555-0100 through 555-0199 are reserved for fictional use
+    return digits[3:8] != '55501'
+
 
 def detect_sensitive_content(text: str, known_ids: Set[str] = None) -> Tuple[bool, List[Tuple[str, str]]]:
     """
@@ -20,6 +56,10 @@ def detect_sensitive_content(text: str, known_ids: Set[str] = None) -> Tuple[boo
                                              content was found, and the second is a list of
                                              tuples containing the type and the matched content.
     """
+    # Every phone and address pattern needs a digit; most comments have none
+    if not DIGIT_RE.search(text):
+        return False, []
+
     found_patterns = []
     known_ids = known_ids or set()
 
@@ -27,8 +67,10 @@ def detect_sensitive_content(text: str, known_ids: Set[str] = None) -> Tuple[boo
     logging.debug(f"Known IDs to exclude: {known_ids}")
 
     # Check for phone numbers
-    for pattern in PHONE_PATTERNS:
-        for match in re.finditer(pattern, text):
+    for pattern in PHONE_RES:
+        for match in pattern.finditer(text):
+            if not is_plausible_phone_number(text, *match.span()):
+                continue
             matched_content = match.group()
             if matched_content not in known_ids:
                 logging.debug(f"Matched phone number: {matched_content}")
@@ -36,10 +78,8 @@ def detect_sensitive_content(text: str, known_ids: Set[str] = None) -> Tuple[boo
             else:
                 logging.debug(f"Excluded known ID: {matched_content}")
 
-    # Check for addresses
-    for pattern in ADDRESS_PATTERNS:
-        for match in re.finditer(pattern, text):
-            matched_content = match.group()
-            found_patterns.append(("address", matched_content))
+    # Check for addresses (no capture groups, so findall yields whole matches)
+    for pattern in ADDRESS_RES:
+        found_patterns.extend(("address", matched_content) for matched_content in pattern.findall(text))
 
     return bool(found_patterns), found_patterns
@@ -2,23 +2,128 @@
 CSV file handling for government edits
 """
 import csv
-import os
 import logging
-from typing import Dict, List, Set, Tuple
-from dateutil import parser
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from processors.content_detector import detect_sensitive_content
 from processors.screenshot import create_diff_url
+from utils.helpers import convert_timestamp
 
 
-def convert_timestamp(utc_timestamp: str) -> str:
-    """Convert UTC timestamp to readable format"""
-    return parser.isoparse(utc_timestamp).strftime('%Y-%m-%d %H:%M:%S')
+CSV_FIELDNAMES = [
+    "Title", "IP Address", "Government Organization", "Timestamp",
+    "Edit ID", "Old Size", "New Size", "Revision ID", "Parent ID",
+    "Diff URL", "Comment", "Screenshot Path", "Contains Sensitive Info"
+]
+
+SENSITIVE_CSV_FIELDNAMES = [
+    "Title", "IP Address", "Government Organization", "Timestamp",
+    "Edit ID", "Diff URL", "Comment", "Sensitive Content Types", "Matched Content"
+]
+
+# Rows handed to writerows at a time, and the write buffer for CSVOutput's long-lived files
+WRITEROWS_BATCH_SIZE = 1000
+CSV_BUFFER_SIZE = 1 << 20
+
+
+def init_csv_files(output_csv: str = "government_changes.csv",
+                   sensitive_csv: str = "sensitive_content_changes.csv"):
+    """
+    Write header rows to the CSV files if they are new or empty
+
+    Called once at startup so save_to_csv doesn't have to probe the files on every write.
+
+    Args:
+        output_csv: Path to main output CSV file
+        sensitive_csv: Path to sensitive content CSV file
+    """
+    for path, fieldnames in ((output_csv, CSV_FIELDNAMES), (sensitive_csv, SENSITIVE_CSV_FIELDNAMES)):
+        with open(path, mode="a", newline="", encoding="utf-8") as file:
+            if file.tell() == 0:
+                csv.DictWriter(file, fieldnames=fieldnames).writeheader()
+
+
+def _change_rows(change: Dict, ip_cache, screenshot_path: str = None,
+                 org: str = None) -> Tuple[Dict, Optional[Dict]]:
+    """Build the main CSV row for one change, plus its sensitive CSV row if it matches"""
+    comment = change.get("comment", "")
+    known_ids = {str(change.get("revid", "")), str(change.get("parentid", ""))}
+    is_sensitive, content_matches = detect_sensitive_content(comment, known_ids=known_ids)
+
+    diff_url = create_diff_url(change.get("revid"), change.get("parentid"))
+
+    if org is not None:
+        change_org = org
+    elif "_org" in change:
+        change_org = change["_org"]
+    else:
+        change_org = ip_cache.check_ip(change.get("user"))[1]
+    timestamp = (change["_ts"].strftime('%Y-%m-%d %H:%M:%S') if "_ts" in change
+                 else convert_timestamp(change.get("timestamp")))
+
+    row = {
+        "Title": change.get("title"),
+        "IP Address": change.get("user"),
+        "Government Organization": change_org,
+        "Timestamp": timestamp,
+        "Edit ID": change.get("rcid"),
+        "Old Size": change.get("oldlen", ""),
+        "New Size": change.get("newlen", ""),
+        "Revision ID": change.get("revid"),
+        "Parent ID": change.get("parentid"),
+        "Diff URL": diff_url,
+        "Comment": comment,
+        "Screenshot Path": screenshot_path or "",
+        "Contains Sensitive Info": "Yes" if is_sensitive else "No"
+    }
+
+    if not is_sensitive:
+        return row, None
+
+    matched_types = [match[0] for match in content_matches]
+    matched_content = [match[1] for match in content_matches]
+    logging.warning(f"Sensitive content detected in edit by {change.get('user')} "
+        f"({change_org}) to {change.get('title')} with matches: {', '.join(matched_content)}")
+    return row, {
+        "Title": change.get("title"),
+        "IP Address": change.get("user"),
+        "Government Organization": change_org,
+        "Timestamp": timestamp,
+        "Edit ID": change.get("rcid"),
+        "Diff URL": diff_url,
+        "Comment": comment,
+        "Sensitive Content Types": ", ".join(matched_types),
+        "Matched Content": "; ".join(matched_content)
+    }
+
+
+def _prefetch_orgs(changes: List[Dict], ip_cache) -> Dict[str, str]:
+    """Look up each distinct IP once for changes that weren't annotated with an organization"""
+    users = {change.get("user") for change in changes if "_org" not in change}
+    return {user: ip_cache.check_ip(user)[1] for user in users}
+
+
+def _write_changes(writer: csv.DictWriter, sensitive_writer: csv.DictWriter,
+                   rows: Iterable[Tuple[Dict, Optional[Dict]]]):
+    """Write (row, sensitive_row) pairs in batches of WRITEROWS_BATCH_SIZE via writerows"""
+    batch, sensitive_batch = [], []
+    for row, sensitive_row in rows:
+        batch.append(row)
+        if sensitive_row is not None:
+            sensitive_batch.append(sensitive_row)
+        if len(batch) >= WRITEROWS_BATCH_SIZE:
+            writer.writerows(batch)
+            sensitive_writer.writerows(sensitive_batch)
+            batch.clear()
+            sensitive_batch.clear()
+    writer.writerows(batch)
+    sensitive_writer.writerows(sensitive_batch)
 
 
 def save_to_csv(changes: List[Dict], ip_cache, output_csv: str = "government_changes.csv",
-                sensitive_csv: str = "sensitive_content_changes.csv", screenshot_path: str = None):
+                sensitive_csv: str = "sensitive_content_changes.csv", screenshot_path: str = None,
+                org: str = None):
     """
-    Save government changes to CSV files
+    Save government changes to CSV files (headers are written by init_csv_files)
 
     Args:
         changes: List of Wikipedia change dictionaries
@@ -26,69 +131,62 @@ def save_to_csv(changes: List[Dict], ip_cache, output_csv: str = "government_cha
         output_csv: Path to main output CSV file
         sensitive_csv: Path to sensitive content CSV file
         screenshot_path: Optional path to screenshot
+        org: Optional organization already matched for these changes (skips lookup)
     """
-    file_exists = os.path.isfile(output_csv)
-    sensitive_exists = os.path.isfile(sensitive_csv)
+    orgs = _prefetch_orgs(changes, ip_cache) if org is None else {}
 
     with open(output_csv, mode="a", newline="", encoding="utf-8") as file, \
          open(sensitive_csv, mode="a", newline="", encoding="utf-8") as sensitive_file:
 
-        writer = csv.writer(file)
-        sensitive_writer = csv.writer(sensitive_file)
-
-        if not file_exists:
-            writer.writerow([
-                "Title", "IP Address", "Government Organization", "Timestamp",
-                "Edit ID", "Old Size", "New Size", "Revision ID", "Parent ID",
-                "Diff URL", "Comment", "Screenshot Path", "Contains Sensitive Info"
-            ])
-
-        if not sensitive_exists:
-            sensitive_writer.writerow([
-                "Title", "IP Address", "Government Organization", "Timestamp",
-                "Edit ID", "Diff URL", "Comment", "Sensitive Content Types"
-            ])
-
-        for change in changes:
-            comment = change.get("comment", "")
-            known_ids = {str(change.get("revid", "")), str(change.get("parentid", ""))}
-            is_sensitive, content_matches = detect_sensitive_content(comment, known_ids=known_ids)
-
-            diff_url = create_diff_url(change.get("revid"), change.get("parentid"))
-
-            _, org = ip_cache.check_ip(change.get("user"))
-
-            # Save to main CSV
-            writer.writerow([
-                change.get("title"),
-                change.get("user"),
-                org,
-                convert_timestamp(change.get("timestamp")),
-                change.get("rcid"),
-                change.get("oldlen", ""),
-                change.get("newlen", ""),
-                change.get("revid"),
-                change.get("parentid"),
-                diff_url,
-                comment,
-                screenshot_path or "",
-                "Yes" if is_sensitive else "No"
-            ])
-
-            # If sensitive, save to separate CSV
-            if is_sensitive:
-                matched_types = [match[0] for match in content_matches]
-                matched_content = [match[1] for match in content_matches]
-                sensitive_writer.writerow([
-                    change.get("title"),
-                    change.get("user"),
-                    org,
-                    convert_timestamp(change.get("timestamp")),
-                    change.get("rcid"),
-                    diff_url,
-                    comment,
-                    ", ".join(matched_types),
-                    "; ".join(matched_content)
-                ])
-                logging.warning(f"Sensitive content detected in edit by {change.get('user')} "
-                    f"({org}) to {change.get('title')} with matches: {', '.join(matched_content)}")
+        writer = csv.DictWriter(file, fieldnames=CSV_FIELDNAMES)
+        sensitive_writer = csv.DictWriter(sensitive_file, fieldnames=SENSITIVE_CSV_FIELDNAMES)
+
+        _write_changes(writer, sensitive_writer,
+                       (_change_rows(change, ip_cache, screenshot_path, orgs.get(change.get("user"), org))
+                        for change in changes))
+
+
+class CSVOutput:
+    """Append-mode CSV writers held open across saves for long-running modes"""
+
+    def __init__(self, output_csv: str = "government_changes.csv",
+                 sensitive_csv: str = "sensitive_content_changes.csv", buffering: int = CSV_BUFFER_SIZE):
+        """
+        Open both CSV files, writing header rows if they are new or empty
+
+        Args:
+            output_csv: Path to main output CSV file
+            sensitive_csv: Path to sensitive content CSV file
+            buffering: Write buffer size for each file
+        """
+        self._file = open(output_csv, mode="a", newline="", encoding="utf-8", buffering=buffering)
+        self._sensitive_file = open(sensitive_csv, mode="a", newline="", encoding="utf-8", buffering=buffering)
+        self.writer = csv.DictWriter(self._file, fieldnames=CSV_FIELDNAMES)
+        self.sensitive_writer = csv.DictWriter(self._sensitive_file, fieldnames=SENSITIVE_CSV_FIELDNAMES)
+
+        if self._file.tell() == 0:
+            self.writer.writeheader()
+        if self._sensitive_file.tell() == 0:
+            self.sensitive_writer.writeheader()
+
+    def save_rows(self, rows: List[Tuple[Dict, str, str]], ip_cache):
+        """
+        Write a batch of changes and flush both files once
+
+        Args:
+            rows: List of (change, screenshot_path, org) tuples
+            ip_cache: IPNetworkCache instance for organization lookup
+        """
+        _write_changes(self.writer, self.sensitive_writer,
+                       (_change_rows(change, ip_cache, screenshot_path, org) for change, screenshot_path, org in rows))
+        self.flush()
+
+    def flush(self):
+        """Flush buffered rows to disk"""
+        self._file.flush()
+        self._sensitive_file.flush()
+
+    def close(self):
+        """Flush and close both files"""
+        self._file.close()
+        self._sensitive_file.close()
@@ -1,19 +1,25 @@
 """
 Screenshot capture for Wikipedia diff pages
 """
+import asyncio
+import atexit
 import os
 import logging
-from playwright.sync_api import sync_playwright
-from dateutil import parser
-from config.settings import SCREENSHOTS_DIR, WIKIPEDIA_DIFF_BASE_URL
+import threading
+from typing import List, Tuple
+from playwright.async_api import async_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
+from utils.helpers import parse_timestamp
+from config.settings import SCREENSHOTS_DIR, SCREENSHOT_WORKERS, WIKIPEDIA_DIFF_BASE_URL
+
+
+# Characters not allowed in filenames, each mapped to '_'
+_FILENAME_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
 
 
 def sanitize_filename(filename: str) -> str:
     """Remove or replace invalid filename characters"""
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    return filename
+    return filename.translate(_FILENAME_TABLE)
 
 
 def create_diff_url(rev_id: int, parent_id: int) -> str:
@@ -21,10 +27,76 @@ def create_diff_url(rev_id: int, parent_id: int) -> str:
     return f"{WIKIPEDIA_DIFF_BASE_URL}?diff={rev_id}&oldid={parent_id}"
 
 
+VIEWPORT = {'width': 1000, 'height': 1920}
+CLIP = {'x': 0, 'y': 0, 'width': 1000, 'height': 1200}
+
+# The diff table is server-rendered, so once it exists the page is ready to capture
+DIFF_SELECTOR = "table.diff, .mw-diff-table"
+DIFF_SELECTOR_TIMEOUT = 5000
+
+
+# Date directories already created this run, so each is only made once
+_created_dirs = set()
+
+
+def screenshot_path(title: str, timestamp: str) -> str:
+    """
+    Build the dated screenshot path for an edit, creating its directory
+
+    Args:
+        title: Article title for filename
+        timestamp: ISO timestamp for organizing screenshots
+
+    Returns:
+        Path the screenshot should be saved to
+    """
+    # Create the date-based subdirectory (and SCREENSHOTS_DIR with it) once per day
+    edit_time = parse_timestamp(timestamp)
+    date_str = edit_time.strftime('%Y-%m-%d')
+    date_dir = os.path.join(SCREENSHOTS_DIR, date_str)
+    if date_dir not in _created_dirs:
+        os.makedirs(date_dir, exist_ok=True)
+        _created_dirs.add(date_dir)
+
+    # Create sanitized filename
+    safe_title = sanitize_filename(title)
+    timestamp_str = edit_time.strftime('%H%M%S')
+    filename = f"{date_str} - {safe_title} - {timestamp_str}.png"
+    return os.path.join(date_dir, filename)
+
+
+_shared_pool = None
+_shared_pool_failed = False
+_shared_pool_lock = threading.Lock()
+
+
+def _get_shared_pool():
+    """
+    Return the process-wide screenshot pool, starting it on first use
+
+    Returns:
+        AsyncScreenshotPool, or None if the browser could not be started
+    """
+    global _shared_pool, _shared_pool_failed
+    with _shared_pool_lock:
+        if _shared_pool is None and not _shared_pool_failed:
+            try:
+                _shared_pool = AsyncScreenshotPool(size=SCREENSHOT_WORKERS)
+                atexit.register(_shared_pool.close)
+            except Exception as e:
+                logging.warning(f"Could not start shared screenshot browser, launching per screenshot: {e}")
+                _shared_pool_failed = True
+        return _shared_pool
+
+
 def take_screenshot(diff_url: str, title: str, timestamp: str) -> str:
     """
     Take screenshot of Wikipedia diff page
 
+    Captures on a browser shared across calls (started on first use and
+    closed at exit), so only the first screenshot pays browser startup.
+    Falls back to launching a browser per call if it can't be started.
+
     Args:
         diff_url: URL to the Wikipedia diff page
         title: Article title for filename
@@ -33,22 +105,33 @@ def take_screenshot(diff_url: str, title: str, timestamp: str) -> str:
     Returns:
         Path to saved screenshot, or None if failed
     """
-    # Create screenshots directory if it doesn't exist
-    if not os.path.exists(SCREENSHOTS_DIR):
-        os.makedirs(SCREENSHOTS_DIR)
+    pool = _get_shared_pool()
+    if pool is not None:
+        return pool.take_screenshot(diff_url, title, timestamp)
 
-    # Create date-based subdirectory
-    date_str = parser.isoparse(timestamp).strftime('%Y-%m-%d')
-    date_dir = os.path.join(SCREENSHOTS_DIR, date_str)
-    if not os.path.exists(date_dir):
-        os.makedirs(date_dir)
+    return _launch_and_capture(diff_url, title, screenshot_path(title, timestamp))
 
-    # Create sanitized filename
-    safe_title = sanitize_filename(title)
-    timestamp_str = parser.isoparse(timestamp).strftime('%H%M%S')
-    filename = f"{date_str} - {safe_title} - {timestamp_str}.png"
-    filepath = os.path.join(date_dir, filename)
 
+def take_screenshots(items: List[Tuple[str, str, str]]) -> List[str]:
+    """
+    Take screenshots for a batch of diffs, concurrently on the shared browser
+
+    Args:
+        items: (diff_url, title, timestamp) tuples
+
+    Returns:
+        Screenshot paths (None for failures) in the same order as items
+    """
+    pool = _get_shared_pool()
+    if pool is not None:
+        return pool.take_screenshots(items)
+
+    return [_launch_and_capture(diff_url, title, screenshot_path(title, timestamp))
+            for diff_url, title, timestamp in items]
+
+
+def _launch_and_capture(diff_url: str, title: str, filepath: str) -> str:
+    """Take one screenshot with a browser launched and closed for this call"""
     p = None
     browser = None
     context = None
@@ -69,9 +152,7 @@ def take_screenshot(diff_url: str, title: str, timestamp: str) -> str:
             logging.debug(f"Chromium browser launched for {title}")
 
         # Create context with viewport size
-        context = browser.new_context(
-            viewport={'width': 1000, 'height': 1920}
-        )
+        context = browser.new_context(viewport=VIEWPORT)
         logging.debug("Context created")
 
         # Create page
@@ -80,24 +161,18 @@ def take_screenshot(diff_url: str, title: str, timestamp: str) -> str:
 
         # Go to URL and wait for content to load (increased timeout)
         logging.debug(f"Loading URL: {diff_url}")
-        page.goto(diff_url, wait_until="networkidle", timeout=30000)
+        page.goto(diff_url, wait_until="domcontentloaded", timeout=30000)
         logging.debug("Page loaded")
 
-        # Wait a bit for any dynamic content
-        page.wait_for_timeout(2000)
-        logging.debug("Waited for dynamic content")
+        # Wait for the diff table; capture whatever rendered if it never appears
+        try:
+            page.wait_for_selector(DIFF_SELECTOR, state="visible", timeout=DIFF_SELECTOR_TIMEOUT)
+        except PlaywrightTimeoutError:
+            logging.debug(f"No diff table after {DIFF_SELECTOR_TIMEOUT}ms, capturing anyway")
 
         # Take screenshot of top portion
         logging.debug(f"Taking screenshot to: {filepath}")
-        page.screenshot(
-            path=filepath,
-            clip={
-                'x': 0,
-                'y': 0,
-                'width': 1000,
-                'height': 1200
-            }
-        )
+        page.screenshot(path=filepath, clip=CLIP)
         logging.debug(f"Screenshot saved successfully: {filepath}")
 
         return filepath
@@ -134,3 +209,164 @@ def take_screenshot(diff_url: str, title: str, timestamp: str) -> str:
                 logging.debug("Playwright stopped")
         except Exception as e:
             logging.debug(f"Error stopping Playwright: {e}")
+
+
+class AsyncScreenshotPool:
+    """
+    Persistent headless browser with a pool of reusable pages
+
+    The browser runs on an asyncio loop in a background thread, so
+    take_screenshot can be called concurrently from worker threads without
+    paying browser startup per capture. Pages that fail are replaced and a
+    disconnected browser is relaunched, so one crash doesn't poison the pool.
+    """
+
+    def __init__(self, size: int = 4):
+        """
+        Start the event loop thread, launch the browser and open the pages
+
+        Args:
+            size: Number of pages (and so concurrent captures) to keep open
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+        self._playwright = None
+        self.browser = None
+        self._closed = False
+        try:
+            self._run(self._start(size))
+        except Exception:
+            self.close()
+            raise
+
+    def _run(self, coro):
+        """Run a coroutine on the pool's loop and wait for its result"""
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result()
+
+    async def _start(self, size: int):
+        self._playwright = await async_playwright().start()
+        self._browser_lock = asyncio.Lock()
+        await self._launch()
+
+        self._pages = asyncio.Queue()
+        for _ in range(size):
+            await self._pages.put(await self._new_page())
+        logging.debug(f"Screenshot pool started with {size} pages")
+
+    async def _launch(self):
+        # Try Firefox first, fallback to Chromium
+        try:
+            self.browser = await self._playwright.firefox.launch(headless=True)
+        except Exception as e:
+            logging.debug(f"Firefox launch failed: {e}, trying Chromium")
+            self.browser = await self._playwright.chromium.launch(headless=True)
+
+    async def _new_page(self):
+        context = await self.browser.new_context(viewport=VIEWPORT)
+        return await context.new_page()
+
+    async def _replace_page(self, page):
+        """Close a broken or stale page's context and open a fresh page in its place"""
+        try:
+            await page.context.close()
+        except Exception:
+            pass  # The context may already be gone with its browser
+        try:
+            return await self._new_page()
+        except Exception as e:
+            # Keep the pool size; the next capture relaunches or retries
+            logging.debug(f"Could not open a replacement page: {e}")
+            return page
+
+    async def _ensure_browser(self):
+        """Relaunch the browser and refill the idle pages if it has disconnected"""
+        async with self._browser_lock:
+            if self.browser.is_connected():
+                return
+            logging.warning("Screenshot browser disconnected, relaunching")
+            await self._launch()
+            idle = [self._pages.get_nowait() for _ in range(self._pages.qsize())]
+            for page in idle:
+                self._pages.put_nowait(await self._replace_page(page))
+
+    async def _capture(self, diff_url: str, title: str, filepath: str) -> str:
+        try:
+            await self._ensure_browser()
+        except Exception as e:
+            logging.warning(f"Error taking screenshot for {title}: {str(e)}")
+            return None
+
+        page = await self._pages.get()
+        healthy = False
+        try:
+            # Pages checked out during a relaunch still belong to the old browser
+            if page.context.browser is not self.browser:
+                page = await self._replace_page(page)
+            await page.goto(diff_url, wait_until="domcontentloaded", timeout=30000)
+            try:
+                await page.wait_for_selector(DIFF_SELECTOR, state="visible", timeout=DIFF_SELECTOR_TIMEOUT)
+            except PlaywrightTimeoutError:
+                logging.debug(f"No diff table after {DIFF_SELECTOR_TIMEOUT}ms, capturing anyway")
+            await page.screenshot(path=filepath, clip=CLIP)
+            healthy = True
+            logging.debug(f"Screenshot saved successfully: {filepath}")
+            return filepath
+        except Exception as e:
+            logging.warning(f"Error taking screenshot for {title}: {str(e)}")
+            return None
+        finally:
+            # A page that crashed or timed out is swapped for a fresh one
+            self._pages.put_nowait(page if healthy else await self._replace_page(page))
+
+    def take_screenshot(self, diff_url: str, title: str, timestamp: str) -> str:
+        """
+        Take screenshot of Wikipedia diff page on one of the pooled pages
+
+        Args:
+            diff_url: URL to the Wikipedia diff page
+            title: Article title for filename
+            timestamp: ISO timestamp for organizing screenshots
+
+        Returns:
+            Path to saved screenshot, or None if failed
+        """
+        filepath = screenshot_path(title, timestamp)
+        return self._run(self._capture(diff_url, title, filepath))
+
+    async def _capture_all(self, jobs: List[Tuple[str, str, str]]) -> List[str]:
+        return await asyncio.gather(*(self._capture(diff_url, title, filepath) for diff_url, title, filepath in jobs))
+
+    def take_screenshots(self, items: List[Tuple[str, str, str]]) -> List[str]:
+        """
+        Take screenshots for several diffs concurrently
+
+        Captures run in parallel up to the number of pooled pages; the rest
+        wait for a free page.
+
+        Args:
+            items: (diff_url, title, timestamp) tuples
+
+        Returns:
+            Screenshot paths (None for failures) in the same order as items
+        """
+        jobs = [(diff_url, title, screenshot_path(title, timestamp)) for diff_url, title, timestamp in items]
+        return self._run(self._capture_all(jobs))
+
+    async def _stop(self):
+        if self.browser:
+            await self.browser.close()
+        if self._playwright:
+            await self._playwright.stop()
+
+    def close(self):
+        """Close the browser and stop the event loop thread (safe to call more than once)"""
+        if self._closed:
+            return
+        self._closed = True
+        try:
+            self._run(self._stop())
+        except Exception as e:
+            logging.debug(f"Error closing screenshot pool: {e}")
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join()
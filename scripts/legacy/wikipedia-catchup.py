@@ -6,7 +6,7 @@ import time
 from collections import deque
 import ipaddress
 import re
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from datetime import datetime, timedelta, timezone
 from typing import Deque, Dict, List, Set, Tuple
 
@@ -47,15 +47,15 @@ def detect_sensitive_content(text: str, known_ids: Set[str] = None) -> Tuple[boo
     known_ids = known_ids or set()
 
     # Phone number patterns
-    for pattern in PHONE_PATTERNS:
-        for match in re.finditer(pattern, text):
+    for pattern in PHONE_RES:
+        for match in pattern.finditer(text):
             matched = match.group()
             if matched not in known_ids:
                 found_patterns.append(("phone_number", matched))
 
     # Address patterns
-    for pattern in ADDRESS_PATTERNS:
-        for match in re.finditer(pattern, text):
+    for pattern in ADDRESS_RES:
+        for match in pattern.finditer(text):
             found_patterns.append(("address", match.group()))
 
     return bool(found_patterns), found_patterns
@@ -132,9 +132,13 @@ ADDRESS_PATTERNS = [
     r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b',
     r'\b(?:PO|P\.O\.) Box\s+\d+\b'
 ]
+PHONE_RES = [re.compile(pattern) for pattern in PHONE_PATTERNS]
+ADDRESS_RES = [re.compile(pattern) for pattern in ADDRESS_PATTERNS]
+
+_FN_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
 
 def sanitize_filename(filename):
-    return re.sub(r'[<>:"/\\|?*]', '_', filename)
+    return filename.translate(_FN_TABLE)
 
 class IPNetworkCache:
     def __init__(self, federal_only=False):
@@ -323,10 +327,13 @@ def take_screenshot(diff_url, title, timestamp):
             page = context.new_page()
             
             # Go to URL and wait for content to load
-            page.goto(diff_url, wait_until="networkidle")
+            page.goto(diff_url, wait_until="domcontentloaded")
             
-            # Wait a bit for any dynamic content
-            page.wait_for_timeout(2000)
+            # Wait for the diff table itself rather than a fixed delay
+            try:
+                page.wait_for_selector('table.diff, .mw-diff-table', state='visible', timeout=5000)
+            except PlaywrightTimeoutError:
+                page.wait_for_timeout(500)
             
             # Take screenshot of top portion
             page.screenshot(
@@ -11,7 +11,7 @@ import time
 from atproto import Client, models
 from datetime import datetime, timedelta, timezone
 from dateutil import parser
-from playwright.sync_api import sync_playwright
+from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeoutError
 from typing import Dict, Set, Union
 from typing import List, Tuple
 import colorama
@@ -71,6 +71,8 @@ ADDRESS_PATTERNS = [
     r'\b\d+\s+[A-Za-z\s]+(?:Street|St|Avenue|Ave|Road|Rd|Boulevard|Blvd|Lane|Ln|Drive|Dr)\b',
     r'\b(?:PO|P\.O\.) Box\s+\d+\b'
 ]
+PHONE_RES = [re.compile(pattern) for pattern in PHONE_PATTERNS]
+ADDRESS_RES = [re.compile(pattern) for pattern in ADDRESS_PATTERNS]
 
 # Wikipedia RC API Params
 params = {
@@ -125,8 +127,8 @@ def detect_sensitive_content(text: str, known_ids: Set[str] = None) -> Tuple[boo
     logging.debug(f"Known IDs to exclude: {known_ids}")
 
     # Check for phone numbers
-    for pattern in PHONE_PATTERNS:
-        for match in re.finditer(pattern, text):
+    for pattern in PHONE_RES:
+        for match in pattern.finditer(text):
             matched_content = match.group()
             if matched_content not in known_ids:
                 logging.debug(f"Matched phone number: {matched_content}")
@@ -135,8 +137,8 @@ def detect_sensitive_content(text: str, known_ids: Set[str] = None) -> Tuple[boo
                 logging.debug(f"Excluded known ID: {matched_content}")
 
     # Check for addresses
-    for pattern in ADDRESS_PATTERNS:
-        for match in re.finditer(pattern, text):
+    for pattern in ADDRESS_RES:
+        for match in pattern.finditer(text):
             matched_content = match.group()
             found_patterns.append(("address", matched_content))
 
@@ -309,6 +311,10 @@ def is_ip_address(user):
     if not user or not isinstance(user, str):
         return False
         
+    # Usernames that don't start with a digit and have no colon can't be IPs
+    if not (user[0].isdigit() or ':' in user):
+        return False
+
     # Check if the user is an IP address (IPv4 or IPv6)
     try:
         ipaddress.ip_address(user)
@@ -331,27 +337,22 @@ def fetch_recent_changes():
         logging.warning(f"Network error while fetching changes: {e}")
         return {"query": {"recentchanges": []}}
 
+# Invalid filename characters mapped to underscores in a single translate pass
+_FN_TABLE = str.maketrans({c: '_' for c in '<>:"/\\|?*'})
+
 def sanitize_filename(filename):
-    # Remove or replace invalid filename characters
-    invalid_chars = '<>:"/\\|?*'
-    for char in invalid_chars:
-        filename = filename.replace(char, '_')
-    return filename
+    return filename.translate(_FN_TABLE)
 
 def take_screenshot(diff_url, title, timestamp):
-    # Create screenshots directory if it doesn't exist
-    if not os.path.exists(SCREENSHOTS_DIR):
-        os.makedirs(SCREENSHOTS_DIR)
-    
-    # Create date-based subdirectory
-    date_str = parser.isoparse(timestamp).strftime('%Y-%m-%d')
+    # Create the date-based subdirectory (and SCREENSHOTS_DIR with it)
+    edit_time = parser.isoparse(timestamp)
+    date_str = edit_time.strftime('%Y-%m-%d')
     date_dir = os.path.join(SCREENSHOTS_DIR, date_str)
-    if not os.path.exists(date_dir):
-        os.makedirs(date_dir)
+    os.makedirs(date_dir, exist_ok=True)
     
     # Create sanitized filename
     safe_title = sanitize_filename(title)
-    timestamp_str = parser.isoparse(timestamp).strftime('%H%M%S')
+    timestamp_str = edit_time.strftime('%H%M%S')
     filename = f"{date_str} - {safe_title} - {timestamp_str}.png"
     filepath = os.path.join(date_dir, filename)
     
@@ -369,10 +370,13 @@ def take_screenshot(diff_url, title, timestamp):
             page = context.new_page()
             
             # Go to URL and wait for content to load
-            page.goto(diff_url, wait_until="networkidle")
+            page.goto(diff_url, wait_until="domcontentloaded")
             
-            # Wait a bit for any dynamic content
-            page.wait_for_timeout(2000)
+            # Wait for the diff table itself rather than a fixed delay
+            try:
+                page.wait_for_selector('table.diff, .mw-diff-table', state='visible', timeout=5000)
+            except PlaywrightTimeoutError:
+                page.wait_for_timeout(500)
             
             # Take screenshot of top portion
             page.screenshot(
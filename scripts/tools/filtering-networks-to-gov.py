@@ -1,3 +1,4 @@
+import re
 import pandas as pd
 
 # Load ARIN data from CSV
@@ -39,10 +40,17 @@ comprehensive_patterns = [
     r"\bagency of\b", r"\badministration of\b",
 ]
 
+# Compile one alternation with the shared word boundaries hoisted out
+# (duplicates dropped); the patterns are all lowercase already
+government_re = re.compile(
+    r"\b(?:" + "|".join(dict.fromkeys(pattern[2:-2] for pattern in comprehensive_patterns)) + r")\b"
+)
+
+# Lowercase the org names once so the regex can match case-sensitively
+orgs_lower = arin_data['Org Name'].fillna('').str.lower()
+
 # Filter the ARIN data using the comprehensive patterns
-filtered_data = arin_data[
-    arin_data['Org Name'].str.contains('|'.join(comprehensive_patterns), case=False, na=False)
-]
+filtered_data = arin_data[orgs_lower.str.contains(government_re)]
 
 # Remove duplicates and reset index for clarity
 filtered_data = filtered_data.drop_duplicates().reset_index(drop=True)
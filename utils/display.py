@@ -0,0 +1,84 @@
+"""
+Terminal display strings shared by the monitoring modes
+"""
+import functools
+import colorama
+
+# Color codes resolved once; colorama's Fore/Style values are plain strings
+FORE = colorama.Fore
+RESET = colorama.Style.RESET_ALL
+RULE = '═' * 58
+
+BANNER_TOP = f"\n{FORE.CYAN}╔{RULE}╗{RESET}"
+BANNER_DIVIDER = f"{FORE.CYAN}╠{RULE}╣{RESET}"
+BANNER_BOTTOM = f"{FORE.CYAN}╚{RULE}╝{RESET}"
+BANNER_ROW = f"{FORE.CYAN}║{RESET} {FORE.WHITE}{{text}}{RESET}{{padding}}{FORE.CYAN}║{RESET}"
+
+ALERT_BOX = (
+    f"\n{FORE.RED}╔{RULE}╗{RESET}\n"
+    f"{FORE.RED}║{RESET} {FORE.RED}🚨 GOVERNMENT EDIT DETECTED{RESET}{' '*26}{FORE.RED}║{RESET}\n"
+    f"{FORE.RED}╚{RULE}╝{RESET}\n"
+)
+SHUTDOWN_BOX = (
+    f"\n\n{FORE.YELLOW}╔{RULE}╗{RESET}\n"
+    f"{FORE.YELLOW}║{RESET} {FORE.YELLOW}⏸️  Shutting down gracefully...{RESET}{' '*26}{FORE.YELLOW}║{RESET}\n"
+    f"{FORE.YELLOW}╚{RULE}╝{RESET}"
+)
+
+TITLE_PREFIX = f"{FORE.WHITE}╭─ {FORE.CYAN}"
+ORG_PREFIX = f"{FORE.WHITE}├─ {FORE.YELLOW}Organization: "
+IP_PREFIX = f"{FORE.WHITE}├─ {FORE.YELLOW}IP Address: {FORE.WHITE}"
+TIME_PREFIX = f"{FORE.WHITE}├─ {FORE.YELLOW}Time: {FORE.WHITE}"
+URL_PREFIX = f"{FORE.WHITE}├─ {FORE.YELLOW}Diff URL: {FORE.BLUE}"
+COMMENT_PREFIX = f"{FORE.WHITE}╰─ {FORE.YELLOW}Comment: {FORE.WHITE}"
+BOX_END = f"{FORE.WHITE}╰{RESET}\n"
+
+# Organization keyword -> display color, checked in order
+ORG_COLOR_MAP = {
+    'senate': FORE.MAGENTA,
+    'house of representatives': FORE.MAGENTA,
+    'congress': FORE.MAGENTA,
+    'department': FORE.BLUE,
+    'white house': FORE.BLUE,
+    'executive': FORE.BLUE,
+    'court': FORE.CYAN,
+}
+
+
+def banner_row(text: str) -> str:
+    """Format a padded white row for the startup banner"""
+    return BANNER_ROW.format(text=text, padding=' ' * (58 - len(text) - 1))
+
+
+@functools.lru_cache(maxsize=None)
+def org_color(org: str) -> str:
+    """Pick the display color for an organization name (cached, orgs come from a fixed list)"""
+    org_lower = org.lower()
+    return next((color for keyword, color in ORG_COLOR_MAP.items() if keyword in org_lower), FORE.YELLOW)
+
+
+def print_change(change: dict, timestamp_str: str, diff_url: str):
+    """
+    Print the boxed terminal alert for one government edit
+
+    Args:
+        change: Annotated change dictionary (uses title, user, comment and _org)
+        timestamp_str: Formatted edit time
+        diff_url: URL to the Wikipedia diff page
+    """
+    org = change["_org"]
+
+    # Create clickable link (works in modern terminals)
+    clickable_url = f"\033]8;;{diff_url}\033\\{diff_url}\033]8;;\033\\"
+
+    print(f"{TITLE_PREFIX}{change.get('title')}{RESET}")
+    print(f"{ORG_PREFIX}{org_color(org)}{org}{RESET}")
+    print(f"{IP_PREFIX}{change.get('user')}{RESET}")
+    print(f"{TIME_PREFIX}{timestamp_str}{RESET}")
+    print(f"{URL_PREFIX}{clickable_url}{RESET}")
+
+    comment = change.get('comment', '')[:80]
+    if comment:
+        print(f"{COMMENT_PREFIX}{comment}...{RESET}\n")
+    else:
+        print(BOX_END)
@@ -1,12 +1,17 @@
 """
 Shared utility functions
 """
-import ipaddress
-import json
+import functools
 import logging
-from dateutil import parser
+import os
+import socket
+import time
+from collections import deque
+from datetime import datetime
+import orjson
 
 
+@functools.lru_cache(maxsize=2048)
 def is_ip_address(user: str) -> bool:
     """
     Check if a string is a valid IP address
@@ -20,23 +25,85 @@ def is_ip_address(user: str) -> bool:
     if not user or not isinstance(user, str):
         return False
 
+    # Most usernames can be rejected on the first character without parsing
+    is_v6 = ':' in user
+    if not (is_v6 or user[0].isdigit()):
+        return False
+
     try:
-        ipaddress.ip_address(user)
+        socket.inet_pton(socket.AF_INET6 if is_v6 else socket.AF_INET, user)
         return True
-    except ValueError:
+    except (OSError, ValueError):
         return False
 
 
+class BoundedSet:
+    """
+    Set that forgets its oldest entries once it holds maxlen items
+
+    Used for processed rcids in long-running monitors. MediaWiki rcids only
+    increase, so an id old enough to be evicted will not be seen again.
+    """
+
+    def __init__(self, maxlen: int = 200_000):
+        """
+        Args:
+            maxlen: Maximum number of entries kept
+        """
+        self._set = set()
+        self._order = deque()
+        self.maxlen = maxlen
+
+    def add(self, item):
+        """Add an item, evicting the oldest entry if the set is full"""
+        if item in self._set:
+            return
+        if len(self._order) >= self.maxlen:
+            self._set.discard(self._order.popleft())
+        self._set.add(item)
+        self._order.append(item)
+
+    def __contains__(self, item) -> bool:
+        return item in self._set
+
+    def __len__(self) -> int:
+        return len(self._set)
+
+
+_clock_cache = [None, ""]
+
+
+def clock_str() -> str:
+    """
+    Current local time as HH:MM:SS for status lines
+
+    The string is reformatted at most once per second however often it is requested.
+
+    Returns:
+        Formatted local time
+    """
+    now = int(time.time())
+    if now != _clock_cache[0]:
+        _clock_cache[0] = now
+        _clock_cache[1] = time.strftime('%H:%M:%S', time.localtime(now))
+    return _clock_cache[1]
+
+
 def save_state(state_file: str, last_timestamp: str):
     """
     Save state to JSON file
 
+    The state is written to a temporary file and renamed over the old one,
+    so an interrupted write never leaves a truncated state file behind.
+
     Args:
         state_file: Path to state file
         last_timestamp: Last processed timestamp
     """
-    with open(state_file, 'w') as f:
-        json.dump({'last_timestamp': last_timestamp}, f)
+    tmp_file = f"{state_file}.tmp"
+    with open(tmp_file, 'wb') as f:
+        f.write(orjson.dumps({'last_timestamp': last_timestamp}))
+    os.replace(tmp_file, state_file)
 
 
 def load_state(state_file: str) -> str:
@@ -50,13 +117,30 @@ def load_state(state_file: str) -> str:
         Last processed timestamp or None if not found
     """
     try:
-        with open(state_file, 'r') as f:
-            data = json.load(f)
+        with open(state_file, 'rb') as f:
+            data = orjson.loads(f.read())
             return data.get('last_timestamp')
-    except (FileNotFoundError, json.JSONDecodeError):
+    except (FileNotFoundError, orjson.JSONDecodeError):
         return None
 
 
+@functools.lru_cache(maxsize=4096)
+def parse_timestamp(utc_timestamp: str) -> datetime:
+    """
+    Parse a Wikipedia UTC timestamp using the stdlib ISO parser
+
+    Results are cached since the same timestamps are formatted for logs,
+    CSV rows and posts.
+
+    Args:
+        utc_timestamp: ISO format UTC timestamp (e.g. 2024-01-01T12:00:00Z)
+
+    Returns:
+        Timezone-aware datetime
+    """
+    return datetime.fromisoformat(utc_timestamp.replace('Z', '+00:00'))
+
+
 def convert_timestamp(utc_timestamp: str) -> str:
     """
     Convert UTC timestamp to readable format
@@ -67,4 +151,4 @@ def convert_timestamp(utc_timestamp: str) -> str:
     Returns:
         Formatted timestamp string
     """
-    return parser.isoparse(utc_timestamp).strftime('%Y-%m-%d %H:%M:%S')
+    return parse_timestamp(utc_timestamp).strftime('%Y-%m-%d %H:%M:%S')